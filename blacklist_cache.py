@@ -0,0 +1,57 @@
+"""
+Locally cached blacklist index.
+The blacklist Google Sheet (phone numbers in the second column) is
+downloaded once and stored as one normalized number per line, so other
+tools can load it as a set (core.load_blacklist_index) for O(1)
+membership checks without a network round trip.
+Refresh the cache with:
+    python blacklist_cache.py <Google Sheets link or ID>
+"""
+
+import sys
+from pathlib import Path
+
+from core import BLACKLIST_CACHE, extract_sheet_id, lazy_import, normalize_series
+from profiling import profiled, span
+
+pd = lazy_import("pandas")
+
+
+def refresh_blacklist_cache(sheet_id, path=BLACKLIST_CACHE):
+    """Download the blacklist sheet and rewrite the local cache; returns its size."""
+    urls = [
+        f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv",
+        f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv",
+    ]
+    blacklist_df = None
+    with span("download blacklist"):
+        for url in urls:
+            try:
+                blacklist_df = pd.read_csv(url, header=None, usecols=[1], dtype=str)
+                break
+            except Exception:
+                continue
+    if blacklist_df is None:
+        raise Exception("Could not connect to Google Sheet blacklist")
+
+    with span("normalize"):
+        numbers = normalize_series(blacklist_df[1]).dropna().unique()
+    tmp_path = Path(str(path) + ".tmp")
+    with span("write cache"):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(sorted(numbers)) + "\n")
+        tmp_path.replace(path)
+    return len(numbers)
+
+
+if __name__ == "__main__":
+    with profiled("blacklist_cache"):  # enters first so --profile is not counted as an argument
+        if len(sys.argv) != 2:
+            print("Usage: python blacklist_cache.py <Google Sheets link or ID> [--profile]")
+            sys.exit(1)
+        sheet_id = extract_sheet_id(sys.argv[1])
+        if not sheet_id:
+            print("❌ Could not extract Sheet ID from the provided URL.")
+            sys.exit(1)
+        count = refresh_blacklist_cache(sheet_id)
+        print(f"✅ Cached {count} blacklisted numbers in {BLACKLIST_CACHE}")
@@ -1,20 +1,19 @@
-import pandas as pd
-import re
+from core import lazy_import, normalize_series
+from profiling import profiled, span
 
-def normalize_number(num):
-    """Convert phone number to plain digits string (removes +, spaces, dashes)."""
-    if pd.isna(num):
-        return None
-    return re.sub(r"\D", "", str(num))  # keep only digits
+pd = lazy_import("pandas")
 
+@profiled("blacklist_checker")
 def check_blacklist(file_numbers, file_blacklist):
     # Read phone numbers from first column, blacklist from second column
-    numbers_df = pd.read_excel(file_numbers, header=None, usecols=[0])
-    blacklist_df = pd.read_excel(file_blacklist, header=None, usecols=[1])
+    with span("read files"):
+        numbers_df = pd.read_excel(file_numbers, header=None, usecols=[0])
+        blacklist_df = pd.read_excel(file_blacklist, header=None, usecols=[1])
    
     # Normalize both columns
-    numbers_df[0] = numbers_df[0].apply(normalize_number)
-    blacklist_df[1] = blacklist_df[1].apply(normalize_number)
+    with span("normalize"):
+        numbers_df[0] = normalize_series(numbers_df[0])
+        blacklist_df[1] = normalize_series(blacklist_df[1])
    
     # Drop empty values
     numbers_df = numbers_df.dropna()
@@ -25,7 +24,8 @@ def check_blacklist(file_numbers, file_blacklist):
     blacklist_set = set(blacklist_df[1])
    
     # Find intersection
-    matches = numbers_set.intersection(blacklist_set)
+    with span("compare"):
+        matches = numbers_set.intersection(blacklist_set)
    
     print(f"Found {len(matches)} matching phone numbers.")
     if matches:
@@ -34,4 +34,5 @@ def check_blacklist(file_numbers, file_blacklist):
         print("No matches found.")
 
 # Run the checker
-check_blacklist("phone_numbers_to_check.xlsx", "blacklist.xlsx")
\ No newline at end of file
+if __name__ == "__main__":
+    check_blacklist("phone_numbers_to_check.xlsx", "blacklist.xlsx")
\ No newline at end of file
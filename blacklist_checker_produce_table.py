@@ -1,31 +1,32 @@
-import pandas as pd
-import re
+from core import lazy_import, normalize_series
+from profiling import profiled, span
 
-def normalize_number(num):
-    """Convert phone number to plain digits string (removes +, spaces, dashes)."""
-    if pd.isna(num):
-        return None
-    return re.sub(r"\D", "", str(num))  # keep only digits
+pd = lazy_import("pandas")
 
+@profiled("blacklist_checker_produce_table")
 def check_blacklist(file_numbers, google_sheet_url, output_filename="cleaned_phone_numbers.xlsx"):
     # Read all data from Excel file (keeping all columns)
-    numbers_df = pd.read_excel(file_numbers)
+    with span("read input"):
+        numbers_df = pd.read_excel(file_numbers)
 
     print(f"Loaded {len(numbers_df)} rows from input file.")
     print(f"Columns found: {list(numbers_df.columns)}")
     
     # Read blacklist from Google Sheet (phone numbers in second column)
-    blacklist_df = pd.read_csv(google_sheet_url, header=None, usecols=[1])
+    with span("download blacklist"):
+        blacklist_df = pd.read_csv(google_sheet_url, header=None, usecols=[1])
     
     # Create normalized phone number column for comparison
     # Assuming phone numbers are in the second column (index 1)
     phone_column = numbers_df.iloc[:, 1]  # Second column
-    normalized_phones = phone_column.apply(normalize_number)
+    with span("normalize"):
+        normalized_phones = normalize_series(phone_column)
     
     # Normalize blacklist numbers
-    blacklist_df[1] = blacklist_df[1].apply(normalize_number)
-    blacklist_df = blacklist_df.dropna()
-    blacklist_set = set(blacklist_df[1])
+    with span("normalize"):
+        blacklist_df[1] = normalize_series(blacklist_df[1])
+        blacklist_df = blacklist_df.dropna()
+        blacklist_set = set(blacklist_df[1])
     
     print(f"Loaded {len(blacklist_set)} numbers from blacklist.")
     
@@ -33,10 +34,11 @@ def check_blacklist(file_numbers, google_sheet_url, output_filename="cleaned_pho
     matches = []
     blacklisted_indices = []
     
-    for idx, norm_phone in enumerate(normalized_phones):
-        if norm_phone and norm_phone in blacklist_set:
-            matches.append(norm_phone)
-            blacklisted_indices.append(idx)
+    with span("compare"):
+        for idx, norm_phone in enumerate(normalized_phones):
+            if norm_phone and norm_phone in blacklist_set:
+                matches.append(norm_phone)
+                blacklisted_indices.append(idx)
     
     # Report results
     print(f"\nFound {len(matches)} matching phone numbers.")
@@ -48,7 +50,8 @@ def check_blacklist(file_numbers, google_sheet_url, output_filename="cleaned_pho
         cleaned_df = numbers_df.drop(blacklisted_indices).reset_index(drop=True)
         
         # Save cleaned dataset
-        cleaned_df.to_excel(output_filename, index=False)
+        with span("save"):
+            cleaned_df.to_excel(output_filename, index=False)
         print(f"Cleaned dataset saved as '{output_filename}' with {len(cleaned_df)} rows.")
         
         # Show some examples of removed entries (first few)
@@ -60,11 +63,13 @@ def check_blacklist(file_numbers, google_sheet_url, output_filename="cleaned_pho
     else:
         print("No matches found. All numbers are clean!")
         # Still save the original file as cleaned version
-        numbers_df.to_excel(output_filename, index=False)
+        with span("save"):
+            numbers_df.to_excel(output_filename, index=False)
         print(f"Original dataset saved as '{output_filename}' (no changes needed).")
     
     return len(matches)
 
+@profiled("blacklist_checker_custom_column")
 def check_blacklist_custom_column(file_numbers, google_sheet_url, phone_column_index=1, 
                                 output_filename="cleaned_phone_numbers.xlsx"):
     """
@@ -77,7 +82,8 @@ def check_blacklist_custom_column(file_numbers, google_sheet_url, phone_column_i
         output_filename: Name of output Excel file
     """
     # Read all data from Excel file
-    numbers_df = pd.read_excel(file_numbers)
+    with span("read input"):
+        numbers_df = pd.read_excel(file_numbers)
     
     # Validate column index
     if phone_column_index >= len(numbers_df.columns):
@@ -87,16 +93,19 @@ def check_blacklist_custom_column(file_numbers, google_sheet_url, phone_column_i
     print(f"Using column {phone_column_index} ('{numbers_df.columns[phone_column_index]}') for phone numbers.")
     
     # Read blacklist from Google Sheet
-    blacklist_df = pd.read_csv(google_sheet_url, header=None, usecols=[1])
+    with span("download blacklist"):
+        blacklist_df = pd.read_csv(google_sheet_url, header=None, usecols=[1])
     
     # Normalize phone numbers
     phone_column = numbers_df.iloc[:, phone_column_index]
-    normalized_phones = phone_column.apply(normalize_number)
+    with span("normalize"):
+        normalized_phones = normalize_series(phone_column)
     
     # Normalize blacklist
-    blacklist_df[0] = blacklist_df[0].apply(normalize_number)
-    blacklist_df = blacklist_df.dropna()
-    blacklist_set = set(blacklist_df[0])
+    with span("normalize"):
+        blacklist_df[1] = normalize_series(blacklist_df[1])
+        blacklist_df = blacklist_df.dropna()
+        blacklist_set = set(blacklist_df[1])
     
     print(f"Loaded {len(blacklist_set)} numbers from blacklist.")
     
@@ -104,10 +113,11 @@ def check_blacklist_custom_column(file_numbers, google_sheet_url, phone_column_i
     matches = []
     blacklisted_indices = []
     
-    for idx, norm_phone in enumerate(normalized_phones):
-        if norm_phone and norm_phone in blacklist_set:
-            matches.append(norm_phone)
-            blacklisted_indices.append(idx)
+    with span("compare"):
+        for idx, norm_phone in enumerate(normalized_phones):
+            if norm_phone and norm_phone in blacklist_set:
+                matches.append(norm_phone)
+                blacklisted_indices.append(idx)
     
     # Report and save results
     print(f"\nFound {len(matches)} matching phone numbers.")
@@ -115,11 +125,13 @@ def check_blacklist_custom_column(file_numbers, google_sheet_url, phone_column_i
         print("DO NOT CALL these numbers:", sorted(set(matches)))
         
         cleaned_df = numbers_df.drop(blacklisted_indices).reset_index(drop=True)
-        cleaned_df.to_excel(output_filename, index=False)
+        with span("save"):
+            cleaned_df.to_excel(output_filename, index=False)
         print(f"Cleaned dataset saved as '{output_filename}' with {len(cleaned_df)} rows (removed {len(blacklisted_indices)}).")
     else:
         print("No matches found. All numbers are clean!")
-        numbers_df.to_excel(output_filename, index=False)
+        with span("save"):
+            numbers_df.to_excel(output_filename, index=False)
         print(f"Original dataset saved as '{output_filename}' (no changes needed).")
     
     return len(matches)
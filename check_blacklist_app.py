@@ -1,16 +1,19 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
-import pandas as pd
-import re
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-# === Normalization function ===
-def normalize_number(num):
-    if pd.isna(num):
-        return None
-    return re.sub(r"\D", "", str(num))  # keep only digits
+from contact_store import CONTACT_DB, ContactStore, import_cleaner_removed
+from core import extract_sheet_id, lazy_import, normalize_number, normalize_series
+from fuzzy_match import NearMatchIndex
+from profiling import profiled, span, thread_profile
+
+pd = lazy_import("pandas")
+
+RECORD_CONTACTS = True  # record removed numbers as blocked in the shared CONTACT_DB (contact_store.py)
+FUZZY_MATCH = False     # also list numbers one digit off a blacklisted one in *_review.xlsx (not removed)
 
 # === Helper function to find phone column ===
 def find_phone_column(df):
@@ -30,72 +33,89 @@ def find_phone_column(df):
             return col_idx, df.columns[col_idx]
     return 1, df.columns[1] if len(df.columns) > 1 else df.columns[0]
 
-# === Helper function to extract Google Sheet ID ===
-def extract_sheet_id(url_or_id):
-    """Extract Google Sheet ID from URL or validate if it's already an ID"""
-    # If it's already just an ID (alphanumeric string)
-    if re.match(r'^[a-zA-Z0-9_-]+$', url_or_id.strip()) and len(url_or_id.strip()) > 20:
-        return url_or_id.strip()
-    
-    # Extract from full Google Sheets URL
-    patterns = [
-        r'/spreadsheets/d/([a-zA-Z0-9-_]+)',
-        r'id=([a-zA-Z0-9-_]+)',
-        r'/d/([a-zA-Z0-9-_]+)/'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url_or_id)
-        if match:
-            return match.group(1)
-    
-    return None
+# === Blacklist stage (runs on a worker thread) ===
+def fetch_blacklist(google_sheet_urls):
+    """Download the blacklist and normalize it; returns (blacklist set, seconds taken)"""
+    start = time.perf_counter()
+    with thread_profile():
+        blacklist_df = None
+        with span("download blacklist"):
+            for url in google_sheet_urls:
+                try:
+                    blacklist_df = pd.read_csv(url, header=None, usecols=[1])
+                    break
+                except Exception:
+                    continue
+        if blacklist_df is None:
+            raise Exception("Could not connect to Google Sheet blacklist")
+        with span("normalize blacklist"):
+            blacklist_set = set(normalize_series(blacklist_df[1]).dropna())
+    return blacklist_set, time.perf_counter() - start
 
 # === Core cleaning function ===
 def check_blacklist(file_numbers, google_sheet_urls, output_folder, status_callback=None):
     def update_status(message):
         if status_callback:
             status_callback(message)
+    executor = ThreadPoolExecutor(max_workers=1)
     try:
+        # The blacklist downloads while the input is parsed; the two join at the compare step
+        update_status("🌐 Downloading blacklist from Google Sheet (in the background)...")
+        blacklist_future = executor.submit(fetch_blacklist, google_sheet_urls)
+        input_start = time.perf_counter()
         update_status("📄 Loading input file...")
         time.sleep(0.5)
-        if file_numbers.endswith(".xlsx"):
-            numbers_df = pd.read_excel(file_numbers)
-        elif file_numbers.endswith(".csv"):
-            numbers_df = pd.read_csv(file_numbers)
-        else:
-            raise ValueError("Unsupported file format. Please use .xlsx or .csv")
+        with span("load input"):
+            if file_numbers.endswith(".xlsx"):
+                numbers_df = pd.read_excel(file_numbers)
+            elif file_numbers.endswith(".csv"):
+                numbers_df = pd.read_csv(file_numbers)
+            else:
+                raise ValueError("Unsupported file format. Please use .xlsx or .csv")
         update_status(f"✅ Loaded {len(numbers_df)} rows from input file")
-        phone_col_idx, phone_col_name = find_phone_column(numbers_df)
+        with span("detect phone column"):
+            phone_col_idx, phone_col_name = find_phone_column(numbers_df)
         update_status(f"📱 Detected phone column: '{phone_col_name}' (column {phone_col_idx + 1})")
         time.sleep(0.3)
-        update_status("🌐 Downloading blacklist from Google Sheet...")
-        time.sleep(0.5)
-        blacklist_df = None
-        for url in google_sheet_urls:
-            try:
-                blacklist_df = pd.read_csv(url, header=None, usecols=[1])
-                break
-            except Exception:
-                continue
-        
-        if blacklist_df is None:
-            raise Exception("Could not connect to Google Sheet blacklist")
-
         phone_column = numbers_df.iloc[:, phone_col_idx]
-        normalized_phones = phone_column.apply(normalize_number)
-        blacklist_df[1] = blacklist_df[1].apply(normalize_number)
-        blacklist_df = blacklist_df.dropna()
-        blacklist_set = set(blacklist_df[1])
+        with span("normalize input"):
+            normalized_phones = normalize_series(phone_column)
+        input_seconds = time.perf_counter() - input_start
+        with span("wait for blacklist"):
+            blacklist_set, blacklist_seconds = blacklist_future.result()
+        ready_seconds = time.perf_counter() - input_start
         update_status(f"✅ Loaded {len(blacklist_set)} numbers from blacklist")
+        update_status(f"⏱️ Input {input_seconds:.1f}s, blacklist {blacklist_seconds:.1f}s, both ready after "
+                      f"{ready_seconds:.1f}s (overlap saved {input_seconds + blacklist_seconds - ready_seconds:.1f}s)")
         time.sleep(0.3)
         update_status("🔍 Comparing phone numbers...")
         time.sleep(0.5)
-        blacklisted_indices = [
-            idx for idx, norm_phone in enumerate(normalized_phones)
-            if norm_phone and norm_phone in blacklist_set
-        ]
+        with span("compare"):
+            blacklisted_indices = [
+                idx for idx, norm_phone in enumerate(normalized_phones)
+                if norm_phone and norm_phone in blacklist_set
+            ]
         update_status(f"⚠️  Found {len(blacklisted_indices)} matches to remove")
+        if RECORD_CONTACTS and blacklisted_indices:
+            with span("record contacts"):
+                contacts = ContactStore(CONTACT_DB)
+                try:
+                    added = import_cleaner_removed(contacts, normalized_phones.iloc[blacklisted_indices],
+                                                   phone_column.iloc[blacklisted_indices].astype(str),
+                                                   source=os.path.basename(file_numbers))
+                finally:
+                    contacts.close()
+            update_status(f"📇 {added} newly blocked numbers recorded in {CONTACT_DB}")
+        if FUZZY_MATCH:
+            update_status("🔎 Looking for near matches (one digit off)...")
+            with span("near matches"):
+                near = NearMatchIndex(blacklist_set).near_matches(normalized_phones.tolist())
+                blacklisted = set(blacklisted_indices)
+                review_indices = [idx for idx, match in enumerate(near) if match and idx not in blacklisted]
+            review_df = numbers_df.iloc[review_indices].copy()
+            review_df["Near blacklist number"] = [near[idx][0] for idx in review_indices]
+            review_df["Difference"] = [near[idx][1] for idx in review_indices]
+            update_status(f"🔎 Found {len(review_indices)} near matches to review (kept in the cleaned file)")
         time.sleep(0.3)
         update_status("📝 Creating cleaned dataset...")
         cleaned_df = numbers_df.drop(blacklisted_indices).reset_index(drop=True)
@@ -104,16 +124,24 @@ def check_blacklist(file_numbers, google_sheet_urls, output_folder, status_callb
         cleaned_path = os.path.join(output_folder, f"{base_name}_cleaned.xlsx")
         removed_path = os.path.join(output_folder, f"{base_name}_removed.xlsx")
         update_status("💾 Saving files...")
-        cleaned_df.to_excel(cleaned_path, index=False)
-        removed_df.to_excel(removed_path, index=False)
+        with span("save"):
+            cleaned_df.to_excel(cleaned_path, index=False)
+            removed_df.to_excel(removed_path, index=False)
+            if FUZZY_MATCH:
+                review_path = os.path.join(output_folder, f"{base_name}_review.xlsx")
+                review_df.to_excel(review_path, index=False)
+                update_status(f"📄 Near matches saved for review: {os.path.basename(review_path)}")
         time.sleep(0.3)
         update_status("✅ Processing complete!")
         return len(blacklisted_indices), cleaned_path, removed_path
     except Exception as e:
         update_status(f"❌ Error: {str(e)}")
         raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 # === GUI ===
+@profiled("check_blacklist_app")
 def run_app():
     root = tk.Tk()
     root.title("Excel/CSV Blacklist Cleaner v2.1")
@@ -266,9 +294,10 @@ def run_app():
                 update_status(f"📂 Output folder: {output_folder}")
                 update_status("-" * 50)
                 
-                matches, cleaned_path, removed_path = check_blacklist(
-                    input_file, google_sheet_urls, output_folder, update_status
-                )
+                with thread_profile():
+                    matches, cleaned_path, removed_path = check_blacklist(
+                        input_file, google_sheet_urls, output_folder, update_status
+                    )
                 
                 update_status("-" * 50)
                 update_status("🎉 PROCESS COMPLETED SUCCESSFULLY!")
@@ -324,6 +353,7 @@ The program will:
 ✅ Create two output files:
    - *_cleaned.xlsx (numbers NOT on blacklist)  
    - *_removed.xlsx (numbers that WERE on blacklist)
+   - *_review.xlsx (one digit off a blacklisted number, if FUZZY_MATCH is on)
 
 Ready to clean your phone list! 📞✨
 """
@@ -0,0 +1,60 @@
+"""
+Cross-sheet contact aggregation for the daily report.
+The same driver is often logged by more than one recruiter, each typing
+the phone number differently. aggregate_contacts() canonicalizes every
+phone in one vectorized pass, groups contacts by canonical number in a
+dict (one pass, linear in the number of contacts) and merges each group
+into a single contact with all comments, dates and source sheets.
+Numbers found in the local blacklist index can be flagged on the way.
+"""
+
+from core import lazy_import, normalize_series
+
+pd = lazy_import("pandas")
+
+BLACKLIST_FLAG = "BLACKLISTED"  # prefixed to the comment of flagged contacts
+
+
+def _join_unique(values, separator):
+    """Non-empty values in first-seen order, without repeats"""
+    return separator.join(dict.fromkeys(str(value) for value in values if value != ""))
+
+
+def aggregate_contacts(contacts, blacklist=None):
+    """Merge contacts that share a canonical phone number
+
+    Contacts keep their first-seen order. A contact that was found only
+    once is returned unchanged apart from the added 'canonical' and
+    'blacklisted' keys; merged contacts list every source sheet and row.
+    Contacts without a usable phone are never merged.
+    blacklist: set of normalized numbers to flag (None = no flagging)
+    """
+    if not contacts:
+        return []
+    canonical = normalize_series(pd.Series([contact['phone'] for contact in contacts], dtype=object)).tolist()
+
+    groups = {}  # canonical number (or position for phoneless contacts) -> [contacts]
+    for i, (contact, number) in enumerate(zip(contacts, canonical)):
+        # normalize_series leaves NaN/None for numbers without digits
+        groups.setdefault(number if isinstance(number, str) else ("row", i), []).append(contact)
+
+    merged = []
+    for key, group in groups.items():
+        number = key if isinstance(key, str) else None
+        if len(group) == 1:
+            contact = dict(group[0])
+        else:
+            contact = {
+                'sheet': _join_unique((c['sheet'] for c in group), ", "),
+                'row': ", ".join(f"{c['sheet']}:{c['row']}" for c in group),
+                'name': next((c['name'] for c in group if c['name']), ""),
+                'phone': group[0]['phone'],
+                'comment': _join_unique((c['comment'] for c in group), " | "),
+                'date': _join_unique((c['date'] for c in group), ", "),
+            }
+        contact['canonical'] = number
+        contact['blacklisted'] = bool(blacklist) and number in blacklist
+        if contact['blacklisted']:
+            contact['comment'] = f"{BLACKLIST_FLAG} | {contact['comment']}" if contact['comment'] else BLACKLIST_FLAG
+        merged.append(contact)
+    return merged
@@ -0,0 +1,186 @@
+"""
+Central contact-state store shared by the cleaner, dialer, SMS sender and
+report generator.
+One row per normalized phone number (core.normalize_number) with the first
+time it was called, texted, blocked and reported, plus its latest status.
+Each tool keeps its own files and records into this SQLite (WAL) database
+through a thin adapter, so "has this number been called, texted or
+blocked?" is one primary-key lookup instead of a scan of every CSV and
+workbook. Bulk imports are one executemany() per batch in a transaction.
+Events:
+    called    - marked called in a dialer CSV
+    messaged  - texted by the SMS sender
+    blocked   - removed by the blacklist cleaner (sticky: stays the status)
+    reported  - listed in a Daily Report
+Usage:
+    python contact_store.py lookup <number> [<number> ...]
+    python contact_store.py import-dialer <phone_numbers.csv>
+    python contact_store.py counts
+"""
+
+import csv
+import logging
+import sqlite3
+import sys
+from datetime import datetime
+from itertools import islice
+
+from core import normalize_number
+
+CONTACT_DB = "contacts.db"
+BATCH_SIZE = 50_000             # rows per executemany() transaction
+EVENTS = {
+    "called": "called_at",
+    "messaged": "messaged_at",
+    "blocked": "blocked_at",
+    "reported": "reported_at",
+}
+
+
+class ContactStore:
+    def __init__(self, db_path=CONTACT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                number      TEXT PRIMARY KEY,
+                raw         TEXT NOT NULL,
+                status      TEXT NOT NULL,
+                source      TEXT,
+                called_at   TEXT,
+                messaged_at TEXT,
+                blocked_at  TEXT,
+                reported_at TEXT,
+                updated_at  TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_status ON contacts(status, updated_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_updated ON contacts(updated_at)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # === UPDATES (batched upserts) ===
+    def record(self, event, numbers, source=None, when=None):
+        """Record an event for (normalized, raw) numbers; returns how many rows changed
+
+        Only the first occurrence of an event is stored, so re-importing the
+        same file changes nothing. A blocked number keeps status 'blocked'.
+        """
+        when = when or datetime.now().isoformat(timespec="seconds")
+        return self.record_timed(event, ((number, raw, when) for number, raw in numbers), source)
+
+    def record_timed(self, event, rows, source=None):
+        """record() for (normalized, raw, ISO timestamp) rows, each with its own time"""
+        column = EVENTS[event]
+        sql = f"""
+            INSERT INTO contacts (number, raw, status, source, {column}, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(number) DO UPDATE SET
+                {column} = excluded.{column},
+                status = CASE WHEN status = 'blocked' THEN status ELSE excluded.status END,
+                source = excluded.source,
+                updated_at = excluded.updated_at
+            WHERE {column} IS NULL
+        """
+        rows = ((number, raw, event, source, when, when) for number, raw, when in rows if number)
+        changed = 0
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            with self.conn:
+                before = self.conn.total_changes
+                self.conn.executemany(sql, batch)
+                changed += self.conn.total_changes - before
+        logging.info("Recorded %d %s numbers in %s.", changed, event, self.db_path)
+        return changed
+
+    # === QUERIES (indexed) ===
+    def lookup(self, number):
+        """Everything known about a number (raw or normalized), or None"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        row = cursor.execute("SELECT * FROM contacts WHERE number = ?", (normalize_number(number),)).fetchone()
+        return dict(row) if row else None
+
+    def has(self, number, event):
+        """Was this number ever called / messaged / blocked / reported?"""
+        row = self.conn.execute(
+            f"SELECT {EVENTS[event]} IS NOT NULL FROM contacts WHERE number = ?",
+            (normalize_number(number),)).fetchone()
+        return bool(row and row[0])
+
+    def numbers_with(self, event, since=None):
+        """Set of numbers that ever had `event` (first recorded since an ISO timestamp)
+
+        Selects on the event's own column, not the current status, which a
+        later event replaces: a texted number that is then called is still texted.
+        """
+        column = EVENTS[event]
+        sql = f"SELECT number FROM contacts WHERE {column} IS NOT NULL"
+        params = []
+        if since is not None:
+            sql += f" AND {column} >= ?"
+            params.append(since)
+        return {number for (number,) in self.conn.execute(sql, params)}
+
+    def status_counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM contacts GROUP BY status"))
+
+
+# === ADAPTERS ===
+def import_dialer_csv(store, csv_file):
+    """Record the rows of a dialer CSV (phone, status) that are marked called"""
+    with open(csv_file, newline="", encoding="utf-8-sig") as f:
+        called = [(normalize_number(row[0]), row[0].strip()) for row in csv.reader(f)
+                  if len(row) > 1 and row[1].strip().lower() == "called"]
+    return store.record("called", called, source=csv_file)
+
+
+def import_sms_campaign(store, campaign):
+    """Record the numbers a CampaignStore has texted, with their send times"""
+    return store.record_timed("messaged", campaign.messaged_rows(), source=campaign.db_path)
+
+
+def sms_exclusions(store):
+    """Numbers the SMS sender should skip: (already texted, blocked by the cleaner)"""
+    return store.numbers_with("messaged"), store.numbers_with("blocked")
+
+
+def import_cleaner_removed(store, numbers, raws, source=None):
+    """Record the numbers a blacklist cleaner run removed as blocked"""
+    return store.record("blocked", zip(numbers, raws), source=source)
+
+
+def import_report_contacts(store, contacts, when=None):
+    """Record Daily Report contacts (canonical number when merged, else their phone)"""
+    rows = [(contact.get("canonical") or normalize_number(contact["phone"]), contact["phone"])
+            for contact in contacts]
+    return store.record("reported", rows, source="Daily Report", when=when)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("lookup", "import-dialer", "counts"):
+        print(__doc__.split("Usage:")[1])
+        sys.exit(1)
+    store = ContactStore(CONTACT_DB)
+    try:
+        if sys.argv[1] == "lookup":
+            for number in sys.argv[2:]:
+                print(f"{number}: {store.lookup(number) or 'unknown'}")
+        elif sys.argv[1] == "import-dialer":
+            for csv_file in sys.argv[2:]:
+                print(f"✅ {csv_file}: {import_dialer_csv(store, csv_file)} newly called numbers")
+        else:
+            for status, count in sorted(store.status_counts().items()):
+                print(f"{status:<10} {count}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,47 @@
-import csv
 import pyperclip
 import keyboard
 import time
 import os
 import sys
 
+from dialer_queue import CALL_WINDOW, CallQueue
+from lazy_numbers import LazyNumbers
+from profiling import profiled, span
+
 # ---------- CONFIG ----------
 CSV_FILE = "phone_numbers.csv"  # Default CSV file name
 PASTE_HOTKEY = "ctrl+v"         # Hotkey to detect pasting
 QUIT_HOTKEY = "ctrl+c"          # Hotkey to quit program
+TIMEZONE_ORDERING = True        # Call leads whose local time is inside CALL_WINDOW (dialer_queue.py) first
 
 def load_numbers(csv_file):
-    """Load phone numbers from CSV file."""
-    numbers = []
-    
+    """Open phone numbers CSV lazily (rows are parsed on demand)."""
     if not os.path.exists(csv_file):
         print(f"❌ Error: {csv_file} not found.")
         return None
     
     try:
-        with open(csv_file, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) == 0:
-                    continue  # Skip empty rows
-                elif len(row) == 1:
-                    # Only phone number, add empty status column
-                    if row[0].strip():  # Only add non-empty phone numbers
-                        numbers.append([row[0].strip(), ""])
-                else:
-                    # Phone number and status
-                    if row[0].strip():  # Only add non-empty phone numbers
-                        numbers.append([row[0].strip(), row[1].strip()])
-        
-        print(f"✅ Loaded {len(numbers)} phone numbers from '{csv_file}'")
+        numbers = LazyNumbers(csv_file)
+        print(f"✅ Opened '{csv_file}'")
+        if numbers.status:
+            print(f"📒 Restored {len(numbers.status)} statuses from {numbers.journal_file}")
         return numbers
         
     except Exception as e:
         print(f"❌ Error reading CSV file: {e}")
         return None
 
-def save_numbers(csv_file, numbers):
-    """Save phone numbers back to CSV file."""
-    try:
-        with open(csv_file, "w", newline="", encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerows(numbers)
-        return True
-    except Exception as e:
-        print(f"❌ Error saving CSV file: {e}")
-        return False
+def save_numbers(numbers, index):
+    """Mark a phone number as called (journaled, merged into the CSV on exit)."""
+    return numbers.mark_called(index)
 
 def find_next_uncalled(numbers, start_index=0):
     """Find the next uncalled phone number starting from start_index."""
-    for i in range(start_index, len(numbers)):
-        if numbers[i][1].strip().lower() != "called":
-            return i
+    for i, row in numbers.uncalled_rows(start_index):
+        return i
     return None
 
+@profiled("copy_paste")
 def main():
     """Main function to run the phone number automator."""
     print("🚀 Phone Number Automation Tool")
@@ -69,29 +53,24 @@ def main():
         csv_file = CSV_FILE
     
     # Load numbers from CSV
-    numbers = load_numbers(csv_file)
+    with span("load numbers"):
+        numbers = load_numbers(csv_file)
     if numbers is None:
         return
     
-    if len(numbers) == 0:
-        print("❌ No phone numbers found in the file.")
-        return
-    
-    # Display summary
-    total_numbers = len(numbers)
-    called_numbers = sum(1 for row in numbers if row[1].strip().lower() == "called")
-    remaining_numbers = total_numbers - called_numbers
-    
-    print(f"📊 Summary:")
-    print(f"   Total numbers: {total_numbers}")
-    print(f"   Already called: {called_numbers}")
-    print(f"   Remaining: {remaining_numbers}")
-    print()
+    # Order uncalled numbers by local calling window (falls back to file order)
+    with span("build queue"):
+        queue = CallQueue(numbers.uncalled_rows(), CALL_WINDOW) if TIMEZONE_ORDERING else None
     
     # Find first uncalled number
-    index = find_next_uncalled(numbers)
+    with span("next number"):
+        index = queue.pop_next() if queue is not None else find_next_uncalled(numbers)
     if index is None:
-        print("🎉 All numbers already marked as called!")
+        if numbers.summary()[0] == 0:
+            print("❌ No phone numbers found in the file.")
+        else:
+            print("🎉 All numbers already marked as called!")
+        numbers.close()
         return
     
     # Copy first number to clipboard
@@ -100,8 +79,18 @@ def main():
         print(f"📋 First number copied to clipboard: {numbers[index][0]}")
     except Exception as e:
         print(f"❌ Error copying to clipboard: {e}")
+        numbers.close()
         return
     
+    # Display summary (after the first copy so it never delays the first number)
+    total_numbers, called_numbers = numbers.summary()
+    remaining_numbers = total_numbers - called_numbers
+    
+    print(f"📊 Summary:")
+    print(f"   Total numbers: {total_numbers}")
+    print(f"   Already called: {called_numbers}")
+    print(f"   Remaining: {remaining_numbers}")
+    
     print("\n📝 Instructions:")
     print("   • Paste the number anywhere using Ctrl+V")
     print("   • Program will automatically verify and move to next number")
@@ -121,10 +110,11 @@ def main():
     keyboard.add_hotkey(QUIT_HOTKEY, on_quit)
     
     # ---------- MAIN LOOP ----------
-    while running and index is not None and index < len(numbers):
+    while running and index is not None:
         try:
             # Wait for paste hotkey
-            keyboard.wait(PASTE_HOTKEY)
+            with span("wait for paste"):
+                keyboard.wait(PASTE_HOTKEY)
             
             if not running:  # Check if user pressed Ctrl+C
                 break
@@ -140,16 +130,19 @@ def main():
                 if pasted == expected:
                     print(f"✅ Verified paste: {expected}")
                     
-                    # Mark as called
-                    numbers[index][1] = "called"
-                    
-                    # Save CSV
-                    if save_numbers(csv_file, numbers):
+                    # Mark as called and save
+                    with span("save"):
+                        saved = save_numbers(numbers, index)
+                    if saved:
                         print(f"💾 Marked as called and saved to file")
                         print("\n----------\n")
                         
                         # Find next uncalled number
-                        next_index = find_next_uncalled(numbers, index + 1)
+                        with span("next number"):
+                            if queue is not None:
+                                next_index = queue.pop_next()
+                            else:
+                                next_index = find_next_uncalled(numbers, index + 1)
                         
                         if next_index is not None:
                             index = next_index
@@ -179,6 +172,11 @@ def main():
             print(f"❌ Error in main loop: {e}")
             time.sleep(1)
     
+    with span("write csv"):
+        closed = numbers.close()
+    if closed:
+        print("💾 Call statuses written to CSV file")
+    
     print("\n✨ Program finished!")
 
 if __name__ == "__main__":
@@ -1,4 +1,3 @@
-import csv
 import pyperclip
 import keyboard
 import pyautogui
@@ -7,10 +6,18 @@ import os
 import sys
 import win32gui
 
+from contact_store import CONTACT_DB, ContactStore, import_dialer_csv
+from dialer_queue import CALL_WINDOW, CallQueue
+from dialer_telemetry import SessionTelemetry
+from lazy_numbers import LazyNumbers
+from profiling import profiled, span
+
 # ---------- CONFIG ----------
 CSV_FILE = "phone_numbers.csv"  # Default CSV file name
 PASTE_HOTKEY = "ctrl+v"         # Hotkey to detect pasting
 QUIT_HOTKEY = "ctrl+c"          # Hotkey to quit program
+TIMEZONE_ORDERING = True        # Call leads whose local time is inside CALL_WINDOW (dialer_queue.py) first
+RECORD_CONTACTS = True          # Record called numbers in the shared CONTACT_DB (contact_store.py)
 
 def get_active_window_title():
     """Return the title of the currently active window."""
@@ -18,53 +25,33 @@ def get_active_window_title():
     return win32gui.GetWindowText(hwnd)
 
 def load_numbers(csv_file):
-    """Load phone numbers from CSV file."""
-    numbers = []
-    
+    """Open phone numbers CSV lazily (rows are parsed on demand)."""
     if not os.path.exists(csv_file):
         print(f"❌ Error: {csv_file} not found.")
         return None
     
     try:
-        with open(csv_file, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) == 0:
-                    continue  # Skip empty rows
-                elif len(row) == 1:
-                    # Only phone number, add empty status column
-                    if row[0].strip():  # Only add non-empty phone numbers
-                        numbers.append([row[0].strip(), ""])
-                else:
-                    # Phone number and status
-                    if row[0].strip():  # Only add non-empty phone numbers
-                        numbers.append([row[0].strip(), row[1].strip()])
-        
-        print(f"✅ Loaded {len(numbers)} phone numbers from '{csv_file}'")
+        numbers = LazyNumbers(csv_file)
+        print(f"✅ Opened '{csv_file}'")
+        if numbers.status:
+            print(f"📒 Restored {len(numbers.status)} statuses from {numbers.journal_file}")
         return numbers
         
     except Exception as e:
         print(f"❌ Error reading CSV file: {e}")
         return None
 
-def save_numbers(csv_file, numbers):
-    """Save phone numbers back to CSV file."""
-    try:
-        with open(csv_file, "w", newline="", encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerows(numbers)
-        return True
-    except Exception as e:
-        print(f"❌ Error saving CSV file: {e}")
-        return False
+def save_numbers(numbers, index):
+    """Mark a phone number as called (journaled, merged into the CSV on exit)."""
+    return numbers.mark_called(index)
 
 def find_next_uncalled(numbers, start_index=0):
     """Find the next uncalled phone number starting from start_index."""
-    for i in range(start_index, len(numbers)):
-        if numbers[i][1].strip().lower() != "called":
-            return i
+    for i, row in numbers.uncalled_rows(start_index):
+        return i
     return None
 
+@profiled("copy_paste_spedup")
 def main():
     """Main function to run the phone number automator."""
     print("🚀 Phone Number Automation Tool")
@@ -76,39 +63,47 @@ def main():
         csv_file = CSV_FILE
     
     # Load numbers from CSV
-    numbers = load_numbers(csv_file)
+    with span("load numbers"):
+        numbers = load_numbers(csv_file)
     if numbers is None:
         return
     
-    if len(numbers) == 0:
-        print("❌ No phone numbers found in the file.")
-        return
-    
-    # Display summary
-    total_numbers = len(numbers)
-    called_numbers = sum(1 for row in numbers if row[1].strip().lower() == "called")
-    remaining_numbers = total_numbers - called_numbers
-    
-    print(f"📊 Summary:")
-    print(f"   Total numbers: {total_numbers}")
-    print(f"   Already called: {called_numbers}")
-    print(f"   Remaining: {remaining_numbers}")
-    print()
+    # Order uncalled numbers by local calling window (falls back to file order)
+    with span("build queue"):
+        queue = CallQueue(numbers.uncalled_rows(), CALL_WINDOW) if TIMEZONE_ORDERING else None
     
     # Find first uncalled number
-    index = find_next_uncalled(numbers)
+    with span("next number"):
+        index = queue.pop_next() if queue is not None else find_next_uncalled(numbers)
     if index is None:
-        print("🎉 All numbers already marked as called!")
+        if numbers.summary()[0] == 0:
+            print("❌ No phone numbers found in the file.")
+        else:
+            print("🎉 All numbers already marked as called!")
+        numbers.close()
         return
     
+    telemetry = SessionTelemetry(csv_file)
+    
     # Copy first number to clipboard
     try:
         pyperclip.copy(numbers[index][0])
+        telemetry.mark("copied", numbers[index][0])
         print(f"📋 First number copied to clipboard: {numbers[index][0]}")
     except Exception as e:
         print(f"❌ Error copying to clipboard: {e}")
+        numbers.close()
         return
     
+    # Display summary (after the first copy so it never delays the first number)
+    total_numbers, called_numbers = numbers.summary()
+    remaining_numbers = total_numbers - called_numbers
+    
+    print(f"📊 Summary:")
+    print(f"   Total numbers: {total_numbers}")
+    print(f"   Already called: {called_numbers}")
+    print(f"   Remaining: {remaining_numbers}")
+    
     print("\n📝 Instructions:")
     print("   • Paste the number anywhere using Ctrl+V")
     print("   • If pasted in RingCentral, Enter will be pressed automatically")
@@ -129,13 +124,15 @@ def main():
     keyboard.add_hotkey(QUIT_HOTKEY, on_quit)
     
     # ---------- MAIN LOOP ----------
-    while running and index is not None and index < len(numbers):
+    while running and index is not None:
         try:
             # Wait for paste hotkey
-            keyboard.wait(PASTE_HOTKEY)
+            with span("wait for paste"):
+                keyboard.wait(PASTE_HOTKEY)
             
             if not running:  # Check if user pressed Ctrl+C
                 break
+            telemetry.mark("pasted")
             
             # Small delay to ensure paste operation completes
             time.sleep(0.1)
@@ -145,6 +142,7 @@ def main():
             if "RingCentral" in active_title:
                 time.sleep(0.5)  # Wait for paste to register
                 pyautogui.press("enter")
+                telemetry.mark("entered")
                 print(f"✅ Enter pressed in RingCentral ({active_title})")
             
             # Check clipboard content
@@ -155,20 +153,27 @@ def main():
                 if pasted == expected:
                     print(f"✅ Verified paste: {expected}")
                     
-                    # Mark as called
-                    numbers[index][1] = "called"
-                    
-                    # Save CSV
-                    if save_numbers(csv_file, numbers):
+                    # Mark as called and save
+                    with span("save"):
+                        saved = save_numbers(numbers, index)
+                    if saved:
+                        telemetry.mark("saved")
+                        telemetry.end_call()
                         print(f"💾 Marked as called and saved to file")
+                        print(telemetry.status_line())
                         print("\n----------\n")
                         
                         # Find next uncalled number
-                        next_index = find_next_uncalled(numbers, index + 1)
+                        with span("next number"):
+                            if queue is not None:
+                                next_index = queue.pop_next()
+                            else:
+                                next_index = find_next_uncalled(numbers, index + 1)
                         
                         if next_index is not None:
                             index = next_index
                             pyperclip.copy(numbers[index][0])
+                            telemetry.mark("copied", numbers[index][0])
                             print(f"📋 Next number copied: {numbers[index][0]}")
                         else:
                             print("🎉 All phone numbers have been processed!")
@@ -178,6 +183,7 @@ def main():
                         print("❌ Failed to save to file. Continuing...")
                         
                 else:
+                    telemetry.mismatch()
                     print(f"⚠️  WARNING: Pasted '{pasted}' but expected '{expected}'")
                     print("   Status not updated. Please paste the correct number.")
                 
@@ -194,6 +200,25 @@ def main():
             print(f"❌ Error in main loop: {e}")
             time.sleep(1)
     
+    paths = telemetry.export()
+    if paths:
+        print(f"\n{telemetry.status_line()}")
+        print(f"📁 Session telemetry saved: {paths[0]}, {paths[1]}")
+    
+    with span("write csv"):
+        closed = numbers.close()
+    if closed:
+        print("💾 Call statuses written to CSV file")
+    
+    if RECORD_CONTACTS:
+        with span("record contacts"):
+            contacts = ContactStore(CONTACT_DB)
+            try:
+                added = import_dialer_csv(contacts, csv_file)
+            finally:
+                contacts.close()
+        print(f"📇 {added} newly called numbers recorded in {CONTACT_DB}")
+    
     print("\n✨ Program finished!")
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+Shared helpers for the dialer, SMS, blacklist and report scripts.
+Phone normalization (scalar and vectorized), Google Sheets ID parsing,
+the cached blacklist index and the token bucket behind the SMS quotas and
+the Sheets read limiter live here, so every script treats a number the
+same way. This module imports only the standard library; pandas, numpy
+and gspread are loaded through lazy_import() on first use, so the dialer
+and SMS code paths that only handle strings never pay for them.
+"""
+
+import importlib
+import logging
+import re
+from pathlib import Path
+
+BLACKLIST_CACHE = "blacklist_cache.txt"
+EPSILON = 1e-6                  # token shortfall treated as rounding error
+
+_NON_DIGITS = re.compile(r"\D")
+_BARE_SHEET_ID = re.compile(r"^[a-zA-Z0-9_-]{21,}$")
+_SHEET_ID_PATTERNS = (
+    re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)"),
+    re.compile(r"id=([a-zA-Z0-9-_]+)"),
+    re.compile(r"/d/([a-zA-Z0-9-_]+)/"),
+)
+
+
+class _LazyModule:
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """pd = lazy_import("pandas") - pandas is imported the first time pd.<attr> is used"""
+    return _LazyModule(name)
+
+
+def normalize_number(num):
+    """Digits only, with a leading US country code dropped; None if no digits are left."""
+    digits = _NON_DIGITS.sub("", str(num))  # NaN / None / <NA> have no digits
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits or None
+
+
+def normalize_series(series):
+    """Vectorized normalize_number for a pandas Series: '' -> None."""
+    digits = series.astype(str).where(series.notna(), "").str.replace(_NON_DIGITS, "", regex=True)
+    has_country_code = (digits.str.len() == 11) & digits.str.startswith("1")
+    digits = digits.where(~has_country_code, digits.str[1:])
+    return digits.where(digits != "", None)
+
+
+def extract_sheet_id(url_or_id):
+    """Extract Google Sheet ID from URL, or return it unchanged if it already is one"""
+    url_or_id = url_or_id.strip()
+    if _BARE_SHEET_ID.match(url_or_id):
+        return url_or_id
+    for pattern in _SHEET_ID_PATTERNS:
+        match = pattern.search(url_or_id)
+        if match:
+            return match.group(1)
+    return None
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, at most `capacity` stored."""
+
+    def __init__(self, rate, capacity, tokens=None, now=0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity if tokens is None else min(tokens, capacity)
+        self.updated = now
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now, amount=1):
+        """Seconds until `amount` tokens are available."""
+        self._refill(now)
+        missing = amount - self.tokens
+        if missing <= EPSILON:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+    def take(self, now, amount=1):
+        self._refill(now)
+        self.tokens -= amount
+
+
+def load_blacklist_index(path=BLACKLIST_CACHE):
+    """Load the cached blacklist as a frozenset (empty if there is no cache yet)."""
+    path = Path(path)
+    if not path.exists():
+        logging.warning("No blacklist cache at %s; run blacklist_cache.py to create it.", path)
+        return frozenset()
+    with open(path, encoding="utf-8") as f:
+        return frozenset(line.strip() for line in f if line.strip())
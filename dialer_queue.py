@@ -0,0 +1,106 @@
+"""
+Time-zone-aware ordering of uncalled numbers for the dialer.
+Numbers are bucketed by area-code zone, each bucket is a min-heap of file
+positions. The next number is the earliest uncalled one (in file order)
+whose local time is inside the calling window right now, so ordering
+follows the clock automatically: East Coast leads come first in the
+morning, West Coast leads join as their window opens.
+Rows are consumed from the input iterator only as far as needed, so the
+first pick does not require reading the whole call list. When every zone
+is outside the window, at most READ_AHEAD rows are queued and the earliest
+of them is handed out.
+"""
+
+import heapq
+from datetime import datetime, timezone
+
+from nanp_timezones import ZONES, in_window, seconds_until_window, zone_for_number
+
+# ---------- CONFIG ----------
+CALL_WINDOW = (9, 20)   # local hours (start inclusive, end exclusive)
+READ_AHEAD = 1000       # rows queued while every zone is outside the window
+
+
+class CallQueue:
+    """Priority queue of uncalled row indexes, picked in O(zones + log n)."""
+
+    def __init__(self, rows, window=CALL_WINDOW, clock=None):
+        """rows: iterable of (index, [phone, status]) in ascending index order."""
+        self.rows = iter(rows)
+        self.exhausted = False
+        self.window = window
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.heaps = {}   # zone key (None = unknown area code) -> heap of indexes
+
+    def _zone_states(self, now):
+        """Map each zone to whether it is inside the window at `now`."""
+        states = {zone: in_window(zone, self.window, now) for zone in ZONES}
+        states[None] = True   # unknown area codes are never held back
+        return states
+
+    def _open_zones(self, now):
+        states = self._zone_states(now)
+        zones = [zone for zone, heap in self.heaps.items() if heap and states[zone]]
+        if not zones and not self.exhausted:
+            # Every queued index is smaller than any unread row, so reading
+            # only happens when no open zone has anything waiting
+            self._scan(states)
+            zones = [zone for zone, heap in self.heaps.items() if heap and states[zone]]
+        return zones
+
+    def _scan(self, states):
+        """Read rows until one is inside the window; earlier rows go to their heaps.
+
+        With every zone closed only unknown area codes could stop the scan,
+        so reading ends once READ_AHEAD rows are queued.
+        """
+        room = None
+        if not any(states[zone] for zone in ZONES):
+            room = READ_AHEAD - sum(len(heap) for heap in self.heaps.values())
+            if room <= 0:
+                return
+        for index, row in self.rows:
+            if row[1].strip().lower() == "called":
+                continue
+            zone = zone_for_number(row[0])
+            heapq.heappush(self.heaps.setdefault(zone, []), index)
+            if states[zone]:
+                return
+            if room is not None:
+                room -= 1
+                if room == 0:
+                    return
+        self.exhausted = True
+
+    def peek(self, now=None):
+        """Index of the next number inside the calling window, or None."""
+        zones = self._open_zones(now or self.clock())
+        if not zones:
+            return None
+        return min(self.heaps[zone][0] for zone in zones)
+
+    def pop_next(self, now=None, fallback=True):
+        """Remove and return the next number's index.
+
+        When no zone is inside the window and fallback is True, the earliest
+        uncalled number is returned regardless of local time.
+        """
+        zones = self._open_zones(now or self.clock())
+        if not zones and fallback:
+            zones = [zone for zone, heap in self.heaps.items() if heap]
+        if not zones:
+            return None
+        zone = min(zones, key=lambda z: self.heaps[z][0])
+        return heapq.heappop(self.heaps[zone])
+
+    def empty(self):
+        """True once every row has been read and handed out."""
+        return self.exhausted and not any(self.heaps.values())
+
+    def seconds_until_open(self, now=None):
+        """Seconds until some queued number enters its window (None if empty)."""
+        now = now or self.clock()
+        self._open_zones(now)   # make sure queued rows are read up to an open one
+        waits = [0.0 if zone is None else seconds_until_window(zone, self.window, now)
+                 for zone, heap in self.heaps.items() if heap]
+        return min(waits) if waits else None
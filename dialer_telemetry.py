@@ -0,0 +1,164 @@
+"""
+Lightweight session telemetry for the phone number dialer.
+Records per-call timestamps for:
+1. Number copied to clipboard
+2. Paste detected
+3. Enter pressed (RingCentral only)
+4. Status saved to CSV
+Aggregates them into rolling calls/hour, inter-call gaps and latency histograms.
+Exports a per-call CSV and a JSON summary at the end of the session.
+"""
+
+import csv
+import json
+import os
+import time
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+
+# ---------- CONFIG ----------
+TELEMETRY_DIR = "dialer_sessions"   # Folder for session files
+ROLLING_WINDOW = 3600               # Seconds used for the rolling calls/hour figure
+# Histogram bucket upper edges in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2000, 5000, 10000, 30000, 60000, 120000, 300000]
+
+EVENTS = ("copied", "pasted", "entered", "saved")
+
+
+class Histogram:
+    """Fixed-bucket histogram, O(log buckets) per sample."""
+
+    def __init__(self, edges=LATENCY_BUCKETS_MS):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.total = 0.0
+        self.n = 0
+        self.max = 0.0
+
+    def add(self, value_ms):
+        self.counts[bisect_right(self.edges, value_ms)] += 1
+        self.total += value_ms
+        self.n += 1
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def to_dict(self):
+        labels = [f"<={edge}" for edge in self.edges] + [f">{self.edges[-1]}"]
+        return {
+            "count": self.n,
+            "mean_ms": round(self.mean(), 1),
+            "max_ms": round(self.max, 1),
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class SessionTelemetry:
+    """Collects dialer timestamps; the hot-path methods only append floats."""
+
+    def __init__(self, csv_file, output_dir=TELEMETRY_DIR, clock=time.perf_counter):
+        self.csv_file = csv_file
+        self.output_dir = output_dir
+        self.clock = clock
+        self.started_at = datetime.now()
+        self.start = clock()
+        self.calls = []          # one dict of event -> timestamp per completed call
+        self.current = {}
+        self.recent = deque()    # completion times inside the rolling window
+        self.histograms = {
+            "copy_to_paste": Histogram(),
+            "paste_to_enter": Histogram(),
+            "paste_to_saved": Histogram(),
+            "inter_call_gap": Histogram(),
+        }
+        self.mismatches = 0
+
+    # ---------- HOT PATH ----------
+    def mark(self, event, number=None):
+        """Record a timestamp for the current call."""
+        self.current[event] = self.clock()
+        if number is not None:
+            self.current["number"] = number
+
+    def mismatch(self):
+        """Count a paste that did not match the expected number."""
+        self.mismatches += 1
+
+    def end_call(self):
+        """Close the current call and fold it into the aggregates."""
+        call = self.current
+        self.current = {}
+        if "saved" not in call:
+            return
+        copied, pasted = call.get("copied"), call.get("pasted")
+        entered, saved = call.get("entered"), call["saved"]
+        if copied is not None and pasted is not None:
+            self.histograms["copy_to_paste"].add((pasted - copied) * 1000)
+        if pasted is not None:
+            if entered is not None:
+                self.histograms["paste_to_enter"].add((entered - pasted) * 1000)
+            self.histograms["paste_to_saved"].add((saved - pasted) * 1000)
+        if self.calls:
+            self.histograms["inter_call_gap"].add((saved - self.calls[-1]["saved"]) * 1000)
+        self.calls.append(call)
+        self.recent.append(saved)
+        while self.recent and saved - self.recent[0] > ROLLING_WINDOW:
+            self.recent.popleft()
+
+    # ---------- AGGREGATES ----------
+    def calls_per_hour(self):
+        """Rolling calls/hour over the last ROLLING_WINDOW seconds."""
+        if not self.recent:
+            return 0.0
+        window = min(ROLLING_WINDOW, self.clock() - self.start)
+        return len(self.recent) * 3600 / window if window > 0 else 0.0
+
+    def status_line(self):
+        """Compact one-line summary for the console."""
+        gap = self.histograms["inter_call_gap"]
+        lag = self.histograms["paste_to_saved"]
+        return (f"📈 {len(self.calls)} calls | {self.calls_per_hour():.0f}/h | "
+                f"gap {gap.mean() / 1000:.1f}s | paste→saved {lag.mean():.0f}ms | "
+                f"mismatches {self.mismatches}")
+
+    def summary(self):
+        elapsed = self.clock() - self.start
+        return {
+            "csv_file": self.csv_file,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_s": round(elapsed, 1),
+            "calls": len(self.calls),
+            "mismatches": self.mismatches,
+            "calls_per_hour_overall": round(len(self.calls) * 3600 / elapsed, 1) if elapsed > 0 else 0.0,
+            "calls_per_hour_rolling": round(self.calls_per_hour(), 1),
+            "histograms": {name: hist.to_dict() for name, hist in self.histograms.items()},
+        }
+
+    # ---------- EXPORT ----------
+    def export(self):
+        """Write <stamp>_calls.csv and <stamp>_summary.json; returns the paths."""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+            calls_path = os.path.join(self.output_dir, f"{stamp}_calls.csv")
+            summary_path = os.path.join(self.output_dir, f"{stamp}_summary.json")
+
+            with open(calls_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["number"] + [f"{event}_s" for event in EVENTS])
+                for call in self.calls:
+                    writer.writerow([call.get("number", "")] + [
+                        f"{call[event] - self.start:.3f}" if event in call else ""
+                        for event in EVENTS
+                    ])
+
+            with open(summary_path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, indent=2)
+
+            return calls_path, summary_path
+        except Exception as e:
+            print(f"❌ Error saving session telemetry: {e}")
+            return None
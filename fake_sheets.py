@@ -0,0 +1,230 @@
+"""
+In-memory stand-in for the parts of gspread the report generator uses.
+FakeClient.open_by_key() returns a FakeSpreadsheet whose worksheets hold
+plain lists of rows. Every request (one HTTP call in real gspread) is
+counted, sized and delayed by a configurable latency, and can fail with
+a 429 quota error, either at random or after a per-minute quota.
+Values come back the way the Sheets API returns them: strings, trailing
+empty cells and rows trimmed, get_values() padded to a rectangle.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from gspread.exceptions import APIError, WorksheetNotFound
+
+_A1 = re.compile(r"^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$")
+
+
+def column_number(letters):
+    """A -> 1, Z -> 26, AA -> 27"""
+    number = 0
+    for ch in letters:
+        number = number * 26 + ord(ch) - 64
+    return number
+
+
+def parse_a1(cell_range):
+    """'A2:C' -> (first col, first row, last col or None, last row or None), 1-based"""
+    match = _A1.match(cell_range)
+    if not match:
+        raise ValueError(f"Unsupported range: {cell_range}")
+    col1, row1, col2, row2 = match.groups()
+    if match.group(3) is None and match.group(4) is None:  # single cell
+        col2, row2 = col1, row1
+    return (column_number(col1) if col1 else 1, int(row1) if row1 else 1,
+            column_number(col2) if col2 else None, int(row2) if row2 else None)
+
+
+def split_sheet_range(full_range):
+    """"'Mike''s'!A1:C" -> ("Mike's", "A1:C")"""
+    name, _, cell_range = full_range.rpartition("!")
+    if name.startswith("'") and name.endswith("'"):
+        name = name[1:-1].replace("''", "'")
+    return name, cell_range
+
+
+def trim(values):
+    """Drop trailing empty cells and rows, like the API does"""
+    rows = []
+    for row in values:
+        row = [str(cell) for cell in row]
+        while row and row[-1] == "":
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class _QuotaResponse:
+    """Just enough of a requests.Response for gspread's APIError"""
+    status_code = 429
+    text = "Quota exceeded for quota metric 'Read requests'"
+
+    def json(self):
+        return {"error": {"code": 429, "message": self.text, "status": "RESOURCE_EXHAUSTED"}}
+
+
+class FakeAPI:
+    """Request accounting, latency and quota errors shared by one fake spreadsheet"""
+
+    def __init__(self, latency=0.0, error_rate=0.0, quota_per_minute=None, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = deque()       # times of recent requests, for the per-minute quota
+        self.calls = Counter()      # method -> requests
+        self.errors = 0
+        self.bytes = 0              # JSON size of request bodies and responses
+
+    def request(self, method, payload, respond):
+        """Account one request; respond() builds the response if it is not rejected"""
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.calls[method] += 1
+            now = time.monotonic()
+            while self.recent and self.recent[0] <= now - 60:
+                self.recent.popleft()
+            over_quota = self.quota_per_minute is not None and len(self.recent) >= self.quota_per_minute
+            self.recent.append(now)
+            if over_quota or self.rng.random() < self.error_rate:
+                self.errors += 1
+                raise APIError(_QuotaResponse())
+            response = respond()
+            self.bytes += len(json.dumps(payload)) + len(json.dumps(response, default=str))
+        return response
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, sheet_id, rows=None):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.rows = [list(row) for row in rows or []]
+
+    # === local helpers (no request) ===
+    def read(self, cell_range):
+        col1, row1, col2, row2 = parse_a1(cell_range)
+        last_row = len(self.rows) if row2 is None else min(row2, len(self.rows))
+        values = []
+        for row in self.rows[row1 - 1:last_row]:
+            values.append(row[col1 - 1:col2] if col2 is not None else row[col1 - 1:])
+        return trim(values)
+
+    def write(self, cell_range, values):
+        col1, row1, _, _ = parse_a1(cell_range)
+        for i, values_row in enumerate(values):
+            while len(self.rows) < row1 + i:
+                self.rows.append([])
+            row = self.rows[row1 + i - 1]
+            row.extend([""] * (col1 - 1 + len(values_row) - len(row)))
+            row[col1 - 1:col1 - 1 + len(values_row)] = values_row
+        self.spreadsheet.touch()
+
+    # === gspread surface ===
+    def get_values(self, range_name=None):
+        def respond():
+            values = self.read(range_name or "A1:ZZZ")
+            width = max((len(row) for row in values), default=0)
+            return [row + [""] * (width - len(row)) for row in values]
+        return self.spreadsheet.api.request("get_values", range_name, respond)
+
+    def batch_get(self, ranges):
+        return self.spreadsheet.api.request(
+            "batch_get", ranges, lambda: [self.read(cell_range) for cell_range in ranges])
+
+    def append_row(self, values):
+        self.append_rows([values])
+
+    def append_rows(self, values):
+        def respond():
+            self.rows = trim(self.rows)
+            self.rows.extend([str(cell) for cell in row] for row in values)
+            self.spreadsheet.touch()
+            return {"updates": {"updatedRows": len(values)}}
+        self.spreadsheet.api.request("append_rows", values, respond)
+
+    def clear(self):
+        def respond():
+            self.rows = []
+            self.spreadsheet.touch()
+            return {}
+        self.spreadsheet.api.request("clear", self.title, respond)
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id, title="Fake spreadsheet", api=None):
+        self.id = spreadsheet_id
+        self.title = title
+        self.api = api or FakeAPI()
+        self.sheets = []
+        self.revision = 0
+
+    def touch(self):
+        self.revision += 1
+
+    def add_worksheet(self, title, rows=None):
+        worksheet = FakeWorksheet(self, title, len(self.sheets), rows)
+        self.sheets.append(worksheet)
+        return worksheet
+
+    def sheet(self, title):
+        for worksheet in self.sheets:
+            if worksheet.title == title:
+                return worksheet
+        raise WorksheetNotFound(title)
+
+    # === gspread surface ===
+    def worksheets(self):
+        return self.api.request("worksheets", None, lambda: list(self.sheets))
+
+    def worksheet(self, title):
+        return self.api.request("worksheet", title, lambda: self.sheet(title))
+
+    def get_lastUpdateTime(self):
+        return self.api.request("get_lastUpdateTime", None, lambda: f"revision-{self.revision}")
+
+    def values_get(self, range_name, params=None):
+        def respond():
+            name, cell_range = split_sheet_range(range_name)
+            return {"range": range_name, "values": self.sheet(name).read(cell_range)}
+        return self.api.request("values_get", range_name, respond)
+
+    def values_batch_get(self, ranges, params=None):
+        def respond():
+            value_ranges = []
+            for full_range in ranges:
+                name, cell_range = split_sheet_range(full_range)
+                value_ranges.append({"range": full_range, "values": self.sheet(name).read(cell_range)})
+            return {"valueRanges": value_ranges}
+        return self.api.request("values_batch_get", ranges, respond)
+
+    def values_batch_update(self, body):
+        def respond():
+            for data in body["data"]:
+                name, cell_range = split_sheet_range(data["range"])
+                self.sheet(name).write(cell_range, [[str(cell) for cell in row] for row in data["values"]])
+            return {"totalUpdatedRows": sum(len(data["values"]) for data in body["data"])}
+        return self.api.request("values_batch_update", body, respond)
+
+
+class FakeClient:
+    """Stands in for the authorized gspread client"""
+
+    def __init__(self, spreadsheets):
+        self.spreadsheets = {spreadsheet.id: spreadsheet for spreadsheet in spreadsheets}
+
+    def open_by_key(self, key):
+        spreadsheet = self.spreadsheets[key]
+        return spreadsheet.api.request("open_by_key", key, lambda: spreadsheet)
@@ -0,0 +1,223 @@
+"""
+Typo-tolerant blacklist matching.
+Finds blacklisted numbers within one edit of a lead's number: one digit
+mistyped, two adjacent digits swapped, one digit missing or one extra.
+Instead of comparing every pair, each number is expanded into its
+neighbourhood keys, all computed on int64 arrays:
+    digit differs   - the number with digit p zeroed, per position p
+    digits swapped  - digits p, p+1 put in sorted order, per position p
+    digit missing   - the blacklisted number with digit p deleted
+    extra digit     - the lead's number with digit p deleted
+Two numbers of the same length are one substitution (or one adjacent
+swap) apart exactly when their keys for some position p are equal, and
+one deletion apart when the shorter one equals a deletion of the longer.
+Every key family is one sort of the blacklist side plus one searchsorted()
+of the lead side, so a check is O((n + m) log n) per digit position.
+Benchmark (with a brute-force cross-check on a small sample):
+    python fuzzy_match.py --blacklist 1000000 --numbers 1000000
+"""
+
+import argparse
+import random
+import time
+
+from core import lazy_import
+
+np = lazy_import("numpy")
+
+MIN_DIGITS = 7                  # shorter numbers are only matched exactly
+MAX_DIGITS = 15                 # longest number that fits the int64 keys
+REASONS = ["digit differs", "digits swapped", "digit missing", "extra digit"]
+DIGIT_DIFFERS, DIGITS_SWAPPED, DIGIT_MISSING, EXTRA_DIGIT = range(4)
+
+
+def _as_int64(numbers):
+    """Normalized digit strings -> (int64 values, lengths); unusable lengths get length 0"""
+    lengths = np.fromiter((len(number) for number in numbers), dtype=np.int64, count=len(numbers))
+    usable = (lengths >= MIN_DIGITS - 1) & (lengths <= MAX_DIGITS)
+    values = np.zeros(len(numbers), dtype=np.int64)
+    if usable.any():
+        values[usable] = np.array([number for number, ok in zip(numbers, usable) if ok]).astype(np.int64)
+    lengths[~usable] = 0
+    return values, lengths
+
+
+def _digit(values, position):
+    return (values // 10 ** position) % 10
+
+
+def _masked(values, position):
+    """Digit `position` (0 = last digit) set to zero"""
+    return values - _digit(values, position) * 10 ** position
+
+
+def _swapped(values, position):
+    """Digits position and position + 1 in sorted order"""
+    low, high = _digit(values, position), _digit(values, position + 1)
+    scale = 10 ** position
+    return (values - low * scale - high * scale * 10
+            + np.minimum(low, high) * scale + np.maximum(low, high) * scale * 10)
+
+
+def _deleted(values, position):
+    """Digit `position` removed"""
+    scale = 10 ** position
+    return (values // (scale * 10)) * scale + values % scale
+
+
+class _SortedKeys:
+    """Keys of one side sorted once, with the row each key came from"""
+
+    def __init__(self, keys, rows):
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.rows = rows[order]
+
+    def find(self, keys):
+        """(mask of keys that occur, row of the first occurrence for each of them)"""
+        if not len(self.keys):
+            return np.zeros(len(keys), dtype=bool), np.zeros(0, dtype=np.int64)
+        at = np.searchsorted(self.keys, keys)
+        found = self.keys[np.minimum(at, len(self.keys) - 1)] == keys
+        return found, self.rows[at[found]]
+
+
+class NearMatchIndex:
+    """Blacklist index for distance <= 1 lookups of normalized numbers"""
+
+    def __init__(self, blacklist):
+        self.blacklist = sorted(set(number for number in blacklist if number))
+        self.exact = set(self.blacklist)
+        self.values, self.lengths = _as_int64(self.blacklist)
+        self.rows = np.arange(len(self.blacklist), dtype=np.int64)
+
+    def _by_length(self, length):
+        selected = self.lengths == length
+        return self.values[selected], self.rows[selected]
+
+    def near_matches(self, numbers):
+        """For each normalized number: (blacklisted number, reason) or None
+
+        Exact blacklist members and numbers without a near match give None.
+        When several blacklisted numbers are one edit away, one from the
+        first family in REASONS order is reported.
+        """
+        numbers = list(numbers)
+        unique = sorted(set(number for number in numbers
+                            if isinstance(number, str) and number not in self.exact))
+        values, lengths = _as_int64(unique)
+        match_row = np.full(len(unique), -1, dtype=np.int64)
+        reason = np.full(len(unique), -1, dtype=np.int64)
+
+        def settle(rows, found, blacklist_rows, family):
+            """Record a family's matches for the rows that have none yet"""
+            open_rows = rows[found]
+            fresh = match_row[open_rows] == -1
+            match_row[open_rows[fresh]] = blacklist_rows[fresh]
+            reason[open_rows[fresh]] = family
+
+        for length in np.unique(lengths[lengths >= MIN_DIGITS]):
+            length = int(length)
+            rows = np.flatnonzero(lengths == length)
+            lead = values[rows]
+
+            same_values, same_rows = self._by_length(length)
+            for position in range(length):
+                index = _SortedKeys(_masked(same_values, position), same_rows)
+                settle(rows, *index.find(_masked(lead, position)), DIGIT_DIFFERS)
+            for position in range(length - 1):
+                index = _SortedKeys(_swapped(same_values, position), same_rows)
+                settle(rows, *index.find(_swapped(lead, position)), DIGITS_SWAPPED)
+
+            # A digit is missing from the lead: it equals a deletion of a longer number
+            longer_values, longer_rows = self._by_length(length + 1)
+            if len(longer_values):
+                lead_index = _SortedKeys(lead, np.arange(len(rows), dtype=np.int64))
+                for position in range(length + 1):
+                    found, lead_rows = lead_index.find(_deleted(longer_values, position))
+                    settle(rows[lead_rows], np.ones(len(lead_rows), dtype=bool),
+                           longer_rows[found], DIGIT_MISSING)
+
+            # The lead has an extra digit: a deletion of it is blacklisted
+            shorter_values, shorter_rows = self._by_length(length - 1)
+            if len(shorter_values):
+                index = _SortedKeys(shorter_values, shorter_rows)
+                for position in range(length):
+                    settle(rows, *index.find(_deleted(lead, position)), EXTRA_DIGIT)
+
+        near = {number: (self.blacklist[match_row[i]], REASONS[reason[i]])
+                for i, number in enumerate(unique) if match_row[i] != -1}
+        return [near.get(number) for number in numbers]
+
+
+def within_one_edit(a, b):
+    """Reference check: one substitution, adjacent swap, insertion or deletion apart (not equal)"""
+    if a == b or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diff) == 1 or (len(diff) == 2 and diff[1] == diff[0] + 1
+                                  and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    shorter, longer = sorted((a, b), key=len)
+    i = next((i for i in range(len(shorter)) if shorter[i] != longer[i]), len(shorter))
+    return shorter[i:] == longer[i + 1:]
+
+
+def make_typo(number, rng):
+    """The number with one random substitution, adjacent swap, deletion or insertion"""
+    i = rng.randrange(len(number) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return number[:i] + rng.choice("0123456789".replace(number[i], "")) + number[i + 1:]
+    if kind == 1 and number[i] != number[i + 1]:
+        return number[:i] + number[i + 1] + number[i] + number[i + 2:]
+    if kind == 2:
+        return number[:i] + number[i + 1:]
+    return number[:i] + rng.choice("0123456789") + number[i:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time near-match blacklist lookups")
+    parser.add_argument("--blacklist", type=int, default=1_000_000, help="blacklisted numbers")
+    parser.add_argument("--numbers", type=int, default=1_000_000, help="lead numbers to check")
+    parser.add_argument("--typos", type=float, default=0.01, help="share of leads that are a typo of a blacklisted number")
+    parser.add_argument("--sample", type=int, default=2000, help="brute-force cross-check size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    def nanp():
+        return f"{rng.randrange(200, 1000)}{rng.randrange(200, 1000)}{rng.randrange(10000):04d}"
+
+    # Brute-force cross-check on a small, typo-dense sample
+    blacklist = [nanp() for _ in range(args.sample)]
+    leads = [make_typo(rng.choice(blacklist), rng) if rng.random() < 0.5 else nanp() for _ in range(args.sample)]
+    index = NearMatchIndex(blacklist)
+    exact = set(blacklist)
+    for lead, near in zip(leads, index.near_matches(leads)):
+        expected = lead not in exact and any(within_one_edit(lead, number) for number in blacklist)
+        assert (near is not None) == expected, lead
+        assert near is None or within_one_edit(lead, near[0]), (lead, near)
+    print(f"✅ Index agrees with brute force on {args.sample} x {args.sample} numbers")
+
+    blacklist = [nanp() for _ in range(args.blacklist)]
+    leads = [make_typo(rng.choice(blacklist), rng) if rng.random() < args.typos else nanp()
+             for _ in range(args.numbers)]
+    start = time.perf_counter()
+    index = NearMatchIndex(blacklist)
+    built = time.perf_counter() - start
+    near = index.near_matches(leads)
+    elapsed = time.perf_counter() - start
+    found = sum(1 for match in near if match is not None)
+    print(f"{args.blacklist:,} blacklisted x {args.numbers:,} leads: index {built:.1f}s, "
+          f"total {elapsed:.1f}s, {found:,} near matches")
+    counts = {}
+    for match in near:
+        if match is not None:
+            counts[match[1]] = counts.get(match[1], 0) + 1
+    for label in REASONS:
+        print(f"  {label:<15} {counts.get(label, 0):>8,}")
+
+
+if __name__ == "__main__":
+    main()
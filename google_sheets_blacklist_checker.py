@@ -1,22 +1,22 @@
-import pandas as pd
-import re
+from core import lazy_import, normalize_series
+from profiling import profiled, span
 
-def normalize_number(num):
-    """Convert phone number to plain digits string (removes +, spaces, dashes)."""
-    if pd.isna(num):
-        return None
-    return re.sub(r"\D", "", str(num))  # keep only digits
+pd = lazy_import("pandas")
 
+@profiled("google_sheets_blacklist_checker")
 def check_blacklist(file_numbers, google_sheet_url):
     # Read phone numbers from first column (local Excel file)
-    numbers_df = pd.read_excel(file_numbers, header=None, usecols=[0])
+    with span("read input"):
+        numbers_df = pd.read_excel(file_numbers, header=None, usecols=[0])
    
     # Read blacklist from Google Sheet (public view-only CSV)
-    blacklist_df = pd.read_csv(google_sheet_url, header=None, usecols=[1])
+    with span("download blacklist"):
+        blacklist_df = pd.read_csv(google_sheet_url, header=None, usecols=[1])
    
     # Normalize both columns
-    numbers_df[0] = numbers_df[0].apply(normalize_number)
-    blacklist_df[1] = blacklist_df[1].apply(normalize_number)
+    with span("normalize"):
+        numbers_df[0] = normalize_series(numbers_df[0])
+        blacklist_df[1] = normalize_series(blacklist_df[1])
    
     # Drop empty values
     numbers_df = numbers_df.dropna()
@@ -27,7 +27,8 @@ def check_blacklist(file_numbers, google_sheet_url):
     blacklist_set = set(blacklist_df[1])
    
     # Find intersection
-    matches = numbers_set.intersection(blacklist_set)
+    with span("compare"):
+        matches = numbers_set.intersection(blacklist_set)
    
     print(f"Found {len(matches)} matching phone numbers.")
     if matches:
@@ -36,7 +37,8 @@ def check_blacklist(file_numbers, google_sheet_url):
         print("No matches found.")
 
 # Example usage:
-sheet_id = "1Dr3f-uyVGLNL656WJbYJF-p6Ja9ucy4vzNTVfjihCVE"
-google_sheet_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv"
+if __name__ == "__main__":
+    sheet_id = "1Dr3f-uyVGLNL656WJbYJF-p6Ja9ucy4vzNTVfjihCVE"
+    google_sheet_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv"
 
-check_blacklist("phone_numbers_to_check.xlsx", google_sheet_url)
\ No newline at end of file
+    check_blacklist("phone_numbers_to_check.xlsx", google_sheet_url)
\ No newline at end of file
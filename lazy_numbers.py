@@ -0,0 +1,206 @@
+"""
+Lazy, memory-light access to big dialer CSV files.
+The CSV is memory-mapped and only an array('Q') of line start offsets is
+kept in memory, built incrementally as rows are requested. Rows are parsed
+on demand. "called" statuses are appended to <csv>.journal instead of
+rewriting the whole file, and merged back into the CSV on close().
+"""
+
+import csv
+import io
+import mmap
+import os
+import re
+from array import array
+from itertools import accumulate, islice, repeat
+from operator import add
+
+BOM = b"\xef\xbb\xbf"
+CHUNK_SIZE = 1 << 20   # bytes per slice when counting lines
+
+# Line starts whose first column is empty (skipped, like the old loader did).
+# Kept free of ^/$ anchors so the regex engine can skip ahead on the newline.
+_BLANK_LINE = re.compile(rb"\n(?=[ \t]*(?:\r?\n|,|\r?\Z))")
+# A "called" status column
+_CALLED_FIELD = re.compile(rb'(?i),[ \t]*"?called"?[ \t]*\r?(?=[\n,]|\Z)')
+# A run of whole lines whose second column is "called" (atomic: no backtracking state per line)
+_CALLED_RUN = re.compile(rb'(?i)(?>(?:"[^"\n]*+"|[^,"\n]*+),[ \t]*+"?called"?[ \t]*+(?:,[^\n]*+)?\r?\n)++')
+
+
+class LazyNumbers:
+    """Phone number list backed by a memory-mapped CSV file."""
+
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self.journal_file = csv_file + ".journal"
+        self._file = open(csv_file, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.offsets = array("Q", [len(BOM) if self.mm[:3] == BOM else 0])
+        self.fully_indexed = self.offsets[0] >= self.size
+        if self.fully_indexed:
+            del self.offsets[:]
+        self.status = {}        # line index -> status recorded in the journal
+        self._journal = None
+        self._replay_journal()
+
+    # ---------- INDEX ----------
+    def _index_to(self, i):
+        """Extend the offset index until line i is known (or EOF)."""
+        offsets, mm = self.offsets, self.mm
+        while len(offsets) <= i and not self.fully_indexed:
+            nl = mm.find(b"\n", offsets[-1])
+            if nl == -1 or nl + 1 >= self.size:
+                self.fully_indexed = True
+            else:
+                offsets.append(nl + 1)
+        return i < len(offsets)
+
+    def _skip_called(self, i):
+        """Index the run of lines marked called in the CSV from line i on; return the line after it."""
+        start = self.offsets[i]
+        run = _CALLED_RUN.match(self.mm, start)
+        if run is None:
+            return i
+        lines = self.mm[start:run.end()].split(b"\n")[:-1]
+        if len(self.offsets) <= i + len(lines):
+            # Line starts of the run, computed by C loops (no per-line Python code)
+            starts = accumulate(map(add, map(len, lines), repeat(1)), initial=start)
+            at_eof = run.end() >= self.size
+            self.offsets.extend(islice(starts, len(self.offsets) - i, len(lines) + (not at_eof)))
+            self.fully_indexed = self.fully_indexed or at_eof
+        return i + len(lines)
+
+    def _parse(self, i):
+        """Parse line i into [phone, status] without journal overrides."""
+        if not self._index_to(i):
+            return None
+        start = self.offsets[i]
+        end = self.mm.find(b"\n", start)
+        if end == -1:
+            end = self.size
+        text = self.mm[start:end].decode("utf-8").rstrip("\r")
+        fields = next(csv.reader([text]), [])
+        if not fields or not fields[0].strip():
+            return None
+        return [fields[0].strip(), fields[1].strip() if len(fields) > 1 else ""]
+
+    # ---------- ROWS ----------
+    def __getitem__(self, i):
+        row = self._parse(i)
+        if row is not None and i in self.status:
+            row[1] = self.status[i]
+        return row
+
+    def rows(self, start=0):
+        """Yield (line index, [phone, status]) for non-empty rows from start on."""
+        i = start
+        while self._index_to(i):
+            row = self[i]
+            if row is not None:
+                yield i, row
+            i += 1
+
+    def uncalled_rows(self, start=0):
+        """Like rows(), without called rows; runs of them are skipped at C speed."""
+        i = start
+        while self._index_to(i):
+            after_run = self._skip_called(i)
+            if after_run != i:
+                i = after_run
+                continue
+            row = self[i]
+            if row is not None and row[1].lower() != "called":
+                yield i, row
+            i += 1
+
+    def summary(self):
+        """Return (total rows, called rows) using C-speed scans of the map."""
+        mm, size = self.mm, self.size
+        if not size:
+            return 0, 0
+        ends_with_newline = mm[size - 1:size] == b"\n"
+        lines = sum(mm[pos:pos + CHUNK_SIZE].count(b"\n") for pos in range(0, size, CHUNK_SIZE))
+        lines += 0 if ends_with_newline else 1
+        # The match on a trailing newline at EOF is not a blank row
+        blank = len(_BLANK_LINE.findall(mm)) - (1 if ends_with_newline else 0)
+        blank += 1 if self._parse(0) is None else 0
+        called = len(_CALLED_FIELD.findall(mm))
+        called += sum(1 for i in self.status
+                      if (self._parse(i) or ["", ""])[1].lower() != "called")
+        return lines - blank, called
+
+    # ---------- JOURNAL ----------
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, encoding="utf-8") as f:
+            for line in f:
+                index, _, phone = line.rstrip("\n").partition(",")
+                if not index.isdigit():
+                    continue
+                row = self._parse(int(index))
+                # Ignore entries that no longer match the CSV (file edited since)
+                if row is not None and row[0] == phone:
+                    self.status[int(index)] = "called"
+
+    def mark_called(self, i):
+        """Append a 'called' record for line i to the journal."""
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_file, "a", encoding="utf-8")
+            self._journal.write(f"{i},{self[i][0]}\n")
+            self._journal.flush()
+            self.status[i] = "called"
+            return True
+        except Exception as e:
+            print(f"❌ Error saving status: {e}")
+            return False
+
+    def close(self):
+        """Merge journaled statuses into the CSV and release the file."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        changed = sorted(i for i in self.status
+                         if (self._parse(i) or ["", ""])[1].lower() != "called")
+        try:
+            if changed:
+                tmp_file = self.csv_file + ".tmp"
+                with open(tmp_file, "wb") as out:
+                    pos = 0
+                    for i in changed:
+                        start = self.offsets[i]
+                        end = self.mm.find(b"\n", start)
+                        end = self.size if end == -1 else end
+                        eol = b"\r" if self.mm[start:end].endswith(b"\r") else b""
+                        fields = next(csv.reader([self.mm[start:end].decode("utf-8").rstrip("\r")]))
+                        fields = fields + [""] * (2 - len(fields))
+                        fields[1] = "called"
+                        out.write(self.mm[pos:start])
+                        out.write(_format_row(fields).encode("utf-8") + eol)
+                        pos = end
+                    out.write(self.mm[pos:self.size])
+            self._release()
+            if changed:
+                os.replace(tmp_file, self.csv_file)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            return True
+        except Exception as e:
+            self._release()
+            print(f"❌ Error saving CSV file (statuses kept in {self.journal_file}): {e}")
+            return False
+
+    def _release(self):
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self.mm = b""
+        self._file.close()
+
+
+def _format_row(fields):
+    """Format one CSV row without a line terminator."""
+    line = io.StringIO()
+    csv.writer(line, lineterminator="").writerow(fields)
+    return line.getvalue()
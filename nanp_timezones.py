@@ -0,0 +1,175 @@
+"""
+Precomputed NANP area code -> UTC offset lookup table.
+Each area code maps to a zone key; each zone has a standard UTC offset and
+a flag telling whether it observes US/Canada daylight saving time.
+Split area codes use the zone that covers most of their subscribers.
+No external timezone database is needed, so this works the same on every machine.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from core import normalize_number
+
+# zone key -> (standard UTC offset in hours, observes DST)
+ZONES = {
+    "NT": (-3.5, True),    # Newfoundland
+    "AT": (-4, True),      # Atlantic Canada
+    "AST": (-4, False),    # Puerto Rico, US Virgin Islands
+    "ET": (-5, True),
+    "CT": (-6, True),
+    "CST": (-6, False),    # Saskatchewan
+    "MT": (-7, True),
+    "MST": (-7, False),    # Arizona
+    "PT": (-8, True),
+    "AKT": (-9, True),
+    "HST": (-10, False),
+}
+
+_ZONE_AREA_CODES = {
+    "NT": "709 879",
+    "AT": "428 506 782 902",
+    "AST": "340 787 939",
+    "ET": (
+        # CT DE DC
+        "203 475 860 959 302 202 771 "
+        # FL
+        "239 305 321 324 352 386 407 561 645 656 689 727 728 754 772 786 813 863 904 941 954 "
+        # GA
+        "229 404 470 478 678 706 762 770 912 943 "
+        # IN KY ME
+        "260 317 463 574 765 812 930 502 606 859 207 "
+        # MD MA
+        "227 240 301 410 443 667 339 351 413 508 617 774 781 857 978 "
+        # MI NH
+        "231 248 269 313 517 586 616 679 734 810 906 947 989 603 "
+        # NJ
+        "201 551 609 640 732 848 856 862 908 973 "
+        # NY
+        "212 315 329 332 347 363 516 518 585 607 624 631 646 680 716 718 838 845 914 917 929 934 "
+        # NC
+        "252 336 472 704 743 828 910 919 980 984 "
+        # OH
+        "216 220 234 283 326 330 380 419 436 440 513 567 614 740 937 "
+        # PA RI
+        "215 223 267 272 412 445 484 570 582 610 717 724 814 835 878 401 "
+        # SC TN VT
+        "803 821 839 843 854 864 423 865 802 "
+        # VA WV
+        "276 434 540 571 686 703 757 804 826 948 304 681 "
+        # ON
+        "226 249 289 343 365 382 416 437 519 548 613 647 683 705 742 753 807 905 942 "
+        # QC
+        "263 354 367 418 438 450 468 514 579 581 819 873"
+    ),
+    "CT": (
+        # AL AR
+        "205 251 256 334 483 659 938 327 479 501 870 "
+        # FL panhandle IL
+        "448 850 217 224 309 312 331 447 464 618 630 708 730 773 779 815 847 861 872 "
+        # IN IA KS KY
+        "219 319 515 563 641 712 316 620 785 913 270 364 "
+        # LA MN
+        "225 318 337 504 985 218 320 507 612 651 763 924 952 "
+        # MS MO
+        "228 601 662 769 314 417 557 573 636 660 816 975 "
+        # NE ND SD OK
+        "308 402 531 701 605 405 539 572 580 918 "
+        # TN
+        "615 629 731 901 931 "
+        # TX
+        "210 214 254 281 325 346 361 409 430 432 469 512 682 713 726 737 806 817 830 832 "
+        "903 936 940 945 956 972 979 "
+        # WI
+        "262 274 353 414 534 608 715 920 "
+        # MB
+        "204 431 584"
+    ),
+    "CST": "306 474 639",
+    "MT": (
+        # CO ID MT NM
+        "303 719 720 970 983 208 986 406 505 575 "
+        # UT WY TX (El Paso)
+        "385 435 801 307 915 "
+        # AB
+        "368 403 587 780 825"
+    ),
+    "MST": "480 520 602 623 928",
+    "PT": (
+        # CA
+        "209 213 279 310 323 341 350 369 408 415 424 442 510 530 559 562 619 626 628 650 "
+        "657 661 669 707 714 738 747 760 805 818 820 831 837 840 858 909 916 925 949 951 "
+        # NV OR WA
+        "702 725 775 458 503 541 971 206 253 360 425 509 564 "
+        # BC
+        "236 250 257 604 672 778"
+    ),
+    "AKT": "907",
+    "HST": "808",
+}
+
+AREA_CODE_ZONE = {
+    code: zone
+    for zone, codes in _ZONE_AREA_CODES.items()
+    for code in codes.split()
+}
+
+def area_code(number):
+    """Return the 3-digit NANP area code of a phone number, or None."""
+    digits = normalize_number(number)
+    if digits is None or len(digits) != 10:
+        return None
+    return digits[:3]
+
+
+def zone_for_number(number):
+    """Return the zone key for a phone number, or None if unknown."""
+    return AREA_CODE_ZONE.get(area_code(number))
+
+
+def _nth_sunday(year, month, n):
+    first = datetime(year, month, 1)
+    days_to_sunday = (6 - first.weekday()) % 7
+    return first + timedelta(days=days_to_sunday + 7 * (n - 1))
+
+
+def _in_dst(local_standard_time):
+    """US/Canada rule: 2nd Sunday of March 2:00 to 1st Sunday of November 2:00."""
+    year = local_standard_time.year
+    start = _nth_sunday(year, 3, 2).replace(hour=2)
+    end = _nth_sunday(year, 11, 1).replace(hour=1)  # 2:00 daylight == 1:00 standard
+    return start <= local_standard_time < end
+
+
+def utc_offset(zone, now=None):
+    """Current UTC offset of a zone in hours, DST included."""
+    now = now or datetime.now(timezone.utc)
+    std_offset, observes_dst = ZONES[zone]
+    local_standard = now.replace(tzinfo=None) + timedelta(hours=std_offset)
+    if observes_dst and _in_dst(local_standard):
+        return std_offset + 1
+    return std_offset
+
+
+def local_time(zone, now=None):
+    """Current wall-clock time (naive datetime) in a zone."""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(tzinfo=None) + timedelta(hours=utc_offset(zone, now))
+
+
+def in_window(zone, window, now=None):
+    """True if the local hour in `zone` is inside window=(start_hour, end_hour)."""
+    local = local_time(zone, now)
+    hour = local.hour + local.minute / 60
+    start, end = window
+    return start <= hour < end
+
+
+def seconds_until_window(zone, window, now=None):
+    """Seconds until the calling window opens in `zone` (0 if it is open)."""
+    local = local_time(zone, now)
+    hour = local.hour + local.minute / 60 + local.second / 3600
+    start, end = window
+    if start <= hour < end:
+        return 0.0
+    hours = start - hour if hour < start else 24 - hour + start
+    return hours * 3600
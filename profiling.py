@@ -0,0 +1,163 @@
+"""
+Opt-in profiling shared by the entry points.
+Run any entry point with --profile (or PROFILE=1 in the environment) and
+it is wrapped in cProfile and tracemalloc, and the span() blocks placed at
+its hot spots record wall-clock time. When the run ends two files are
+written to the working directory:
+    profile_<name>_<timestamp>.pstats  - cProfile stats (python -m pstats <file>)
+    profile_<name>_<timestamp>.json    - wall time, peak memory and per-span
+                                         count / total / max seconds (totals
+                                         add up over worker threads)
+When profiling is off, span() returns one shared no-op context manager and
+the entry point runs unwrapped.
+Usage:
+    @profiled("report_generator")       # or: with profiled("blacklist_cache"):
+    def main(): ...
+    with span("compare"): ...
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+PROFILE_FLAG = "--profile"
+PROFILE_ENV = "PROFILE"
+
+_NO_SPAN = contextlib.nullcontext()
+_session = None
+
+
+def requested():
+    """Is profiling switched on? Removes --profile from sys.argv so argparse never sees it."""
+    if PROFILE_FLAG in sys.argv[1:]:
+        sys.argv = [sys.argv[0]] + [arg for arg in sys.argv[1:] if arg != PROFILE_FLAG]
+        return True
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+class _Session:
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now()
+        self.lock = threading.Lock()
+        self.spans = {}             # name -> [count, total seconds, max seconds]
+        self.profiles = [cProfile.Profile()]
+
+    def record(self, name, seconds):
+        with self.lock:
+            entry = self.spans.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def write(self, wall_seconds, peak_bytes):
+        """Write the .pstats and .json files; returns their paths"""
+        prefix = f"profile_{self.name}_{self.started:%Y%m%d_%H%M%S}"
+        stats_path, report_path = prefix + ".pstats", prefix + ".json"
+        profiles = [profile for profile in self.profiles if profile.getstats()]
+        if profiles:
+            pstats.Stats(*profiles).dump_stats(stats_path)
+        report = {
+            "name": self.name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_seconds": round(wall_seconds, 6),
+            "peak_memory_bytes": peak_bytes,
+            "pstats": stats_path if profiles else None,
+            "spans": {
+                name: {"count": count, "total_seconds": round(total, 6), "max_seconds": round(longest, 6)}
+                for name, (count, total, longest) in sorted(self.spans.items(), key=lambda item: -item[1][1])
+            },
+        }
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return stats_path, report_path
+
+
+@contextlib.contextmanager
+def _timed(session, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        session.record(name, time.perf_counter() - start)
+
+
+def span(name):
+    """Context manager timing one stage of the run (a no-op unless profiling)"""
+    if _session is None:
+        return _NO_SPAN
+    return _timed(_session, name)
+
+
+@contextlib.contextmanager
+def thread_profile():
+    """cProfile the calling worker thread too (cProfile only sees the thread that enabled it)
+
+    On Python 3.12+ one profiler already covers every thread and a second
+    one cannot be enabled; the worker is then profiled by the main one.
+    """
+    session = _session
+    if session is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        yield
+        return
+    try:
+        yield
+    finally:
+        profile.disable()
+        with session.lock:
+            session.profiles.append(profile)
+
+
+class profiled:
+    """Profile an entry point when --profile / PROFILE=1 is set; usable as decorator or with-block"""
+
+    def __init__(self, name):
+        self.name = name
+        self.active = False
+
+    def __enter__(self):
+        global _session
+        self.active = _session is None and requested()
+        if not self.active:
+            return self
+        _session = _Session(self.name)
+        tracemalloc.start()
+        self.start = time.perf_counter()
+        _session.profiles[0].enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _session
+        if not self.active:
+            return False
+        session = _session
+        session.profiles[0].disable()
+        wall_seconds = time.perf_counter() - self.start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _session = None
+        stats_path, report_path = session.write(wall_seconds, peak_bytes)
+        print(f"📊 Profile: {stats_path}, {report_path} "
+              f"({wall_seconds:.2f}s, peak memory {peak_bytes / 2 ** 20:.1f} MB)")
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiled(self.name):
+                return func(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,112 @@
+"""
+API-usage benchmark for report_generator_sheets.
+Builds a synthetic spreadsheet in fake_sheets (N tabs x M rows, K rows
+per tab dated today) and runs generate_report() against it in each scan
+configuration, reporting Sheets requests, bytes transferred and wall
+time per run. Re-runs use the same spreadsheet, so incremental scans, the
+header cache and the snapshot cache show their effect.
+Usage:
+    python report_benchmark.py --tabs 25 --rows 5000 --matches 20 --latency 0.05
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import report_generator_sheets as report
+from fake_sheets import FakeAPI, FakeClient, FakeSpreadsheet
+
+SPREADSHEET_ID = "fake" + "0" * 40
+FC_COLUMN = 83                  # CG, the generator's fallback column
+
+
+def build_spreadsheet(tabs, rows, matches, api, seed=0, spread=False):
+    """Recruiter tabs with an FC header; `matches` rows per tab are dated today"""
+    rng = random.Random(seed)
+    today = datetime.now().date()
+    spreadsheet = FakeSpreadsheet(SPREADSHEET_ID, api=api)
+    spreadsheet.add_worksheet("Daily Report")
+    spreadsheet.add_worksheet("Approved")
+    for tab in range(tabs):
+        header = ["Name", "Phone", "Comment"] + [""] * (FC_COLUMN - 4) + ["FC"]
+        # Today's contacts are the newest rows, unless spread over the whole tab
+        today_rows = set(rng.sample(range(rows), matches) if spread else range(rows - matches, rows))
+        data = []
+        for i in range(rows):
+            day = today if i in today_rows else today - timedelta(days=1 + (rows - i) // 40)
+            data.append([f"Contact {tab}-{i}", f"({rng.randrange(200, 999)}) 555-{i % 10000:04d}",
+                         rng.choice(["", "call back", "interested", "no answer"])]
+                        + [""] * (FC_COLUMN - 4) + [day.strftime("%d-%m-%y")])
+        spreadsheet.add_worksheet(f"Recruiter {tab + 1}", [header] + data)
+    return spreadsheet
+
+
+def run_report(spreadsheet, **options):
+    """One generate_report() run; returns (requests, errors, bytes, seconds, report rows)"""
+    api = spreadsheet.api
+    api.calls.clear()
+    api.errors = api.bytes = 0
+    saved_input = builtins.input
+    builtins.input = lambda prompt="": "all"
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = report.GoogleSheetsReportGenerator(
+                f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/edit", **options)
+            generator.authenticate = lambda: setattr(generator, "gc", FakeClient([spreadsheet]))
+            generator.generate_report()
+        elapsed = time.perf_counter() - start
+    finally:
+        builtins.input = saved_input
+    report_rows = len(spreadsheet.sheet("Daily Report").read("A2:F"))
+    return api.total_calls(), api.errors, api.bytes, elapsed, report_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sheets API usage of the daily report generator")
+    parser.add_argument("--tabs", type=int, default=25, help="recruiter tabs (N)")
+    parser.add_argument("--rows", type=int, default=2000, help="rows per tab (M)")
+    parser.add_argument("--matches", type=int, default=10, help="rows per tab dated today (K)")
+    parser.add_argument("--spread", action="store_true", help="scatter today's rows instead of appending them")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--quota", type=int, default=None, help="fake per-minute request quota")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    api = FakeAPI(args.latency, args.error_rate, args.quota, args.seed)
+    spreadsheet = build_spreadsheet(args.tabs, args.rows, args.matches, api, args.seed, args.spread)
+    # The real read quota would dominate wall time; only the fake's quota applies here
+    unlimited = dict(limiter=report.RateLimiter(per_minute=10 ** 9, burst=10 ** 6))
+    report.BACKOFF_BASE = 0.05
+
+    print(f"{args.tabs} tabs x {args.rows} rows, {args.matches} matches per tab, "
+          f"{args.latency * 1000:.0f} ms/request")
+    print(f"{'configuration':<28} {'requests':>8} {'429s':>5} {'KB':>9} {'seconds':>8} {'rows':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        state = os.path.join(tmp, "state.json")
+        headers = os.path.join(tmp, "headers.json")
+        snapshot = os.path.join(tmp, "snapshot.db")
+        uncached = dict(state_file=None, header_file=None)
+        runs = [
+            ("per_sheet", dict(uncached, scan_mode="per_sheet")),
+            ("batch", dict(uncached, scan_mode="batch")),
+            ("batch + high-water mark", dict(scan_mode="batch", state_file=state, header_file=headers)),
+            ("  re-run", dict(scan_mode="batch", state_file=state, header_file=headers)),
+            ("per_sheet + high-water mark", dict(scan_mode="per_sheet", state_file=state, header_file=headers)),
+            ("snapshot", dict(uncached, snapshot_file=snapshot)),
+            ("  re-run", dict(uncached, snapshot_file=snapshot)),
+        ]
+        for label, options in runs:
+            calls, errors, size, elapsed, rows = run_report(spreadsheet, **unlimited, **options)
+            print(f"{label:<28} {calls:>8} {errors:>5} {size / 1024:>9.1f} {elapsed:>8.2f} {rows:>6}")
+
+
+if __name__ == "__main__":
+    main()
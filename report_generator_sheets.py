@@ -1,19 +1,102 @@
-import gspread
-from google.auth import default
-from datetime import datetime, date
+from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import random
+import threading
 import time
-import re
+
+from contact_aggregation import aggregate_contacts
+from contact_store import CONTACT_DB, ContactStore, import_report_contacts
+from date_parsing import parse_date_column, parse_date_value
+from report_scan_state import DEFAULT_ROLES, HEADER_CACHE_FILE, SCAN_STATE_FILE, HeaderCache, ScanState, column_roles
+from report_snapshot import SNAPSHOT_DB, SnapshotCache
+from profiling import profiled, span, thread_profile
+from core import BLACKLIST_CACHE, TokenBucket, extract_sheet_id, lazy_import, load_blacklist_index
+
+gspread = lazy_import("gspread")
+google_auth = lazy_import("google.auth")
+
+MAX_RANGES_PER_BATCH = 100      # ranges per batch_get request (keeps the URL short)
+MAX_SPREAD_FACTOR = 3           # read one A:C block if it is at most this many times the matched rows
+HEADER_RANGE = "A1:CZ5"         # where the FC header is searched for
+BATCH_SCAN_KEY = "(all sheets)" # api_calls key for requests that cover every sheet
+METADATA_KEY = "(metadata)"     # api_calls key for the Drive modifiedTime check
+REPORT_SHEET = "Daily Report"
+REPORT_HEADERS = ["Name", "Phone", "Comment", "Date", "Source Sheet", "Source Row"]
+USE_SNAPSHOT = False            # serve unchanged spreadsheets from SNAPSHOT_DB
+OFFLINE = False                 # build the report from the last snapshot without any API call
+REPORT_DAYS = 1                 # > 1: per-day and per-sheet report for the last N days (one scan)
+DEDUP_CONTACTS = True           # merge contacts with the same phone number across sheets
+FLAG_BLACKLIST = False          # mark merged contacts found in the local BLACKLIST_CACHE
+RECORD_CONTACTS = True          # record reported numbers in the shared CONTACT_DB (contact_store.py)
+
+WATCH_MIN_INTERVAL = 30         # seconds between polls right after a change
+WATCH_MAX_INTERVAL = 600        # longest wait between polls of a quiet spreadsheet
+WATCH_BACKOFF = 1.5             # interval growth per poll without changes
+
+MAX_WORKERS = 6                 # sheets scanned at the same time in per_sheet mode
+READ_QUOTA_PER_MINUTE = 60      # Sheets API read requests per minute per user
+READ_BURST = 10                 # requests allowed back to back before the limiter spaces them
+MAX_RETRIES = 5                 # retries of a request answered with 429
+BACKOFF_BASE = 1.0              # seconds; doubled after every 429
+BACKOFF_MAX = 32.0              # cap on a single backoff
+
+
+class RateLimiter:
+    """Token bucket shared by all scanning threads (Sheets per-minute read quota)"""
+    
+    def __init__(self, per_minute=READ_QUOTA_PER_MINUTE, burst=READ_BURST, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.bucket = TokenBucket(per_minute / 60, burst, now=clock())
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until one request may be sent"""
+        while True:
+            with self.lock:
+                now = self.clock()
+                wait = self.bucket.wait_time(now)
+                if wait == 0:
+                    self.bucket.take(now)
+                    return
+            self.sleep(wait)
 
 
 class GoogleSheetsReportGenerator:
-    def __init__(self, spreadsheet_url):
-        """Initialize with Google Sheets URL"""
+    def __init__(self, spreadsheet_url, scan_mode="batch", max_workers=MAX_WORKERS, limiter=None,
+                 state_file=SCAN_STATE_FILE, snapshot_file=None, offline=False, header_file=HEADER_CACHE_FILE,
+                 dedup=DEDUP_CONTACTS, blacklist_file=None, contact_db=None):
+        """Initialize with Google Sheets URL; scan_mode is "batch" or "per_sheet", file options None = off"""
         self.spreadsheet_url = spreadsheet_url
+        self.scan_mode = scan_mode
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter()
+        self.lock = threading.Lock()
+        self.scan_state = ScanState(state_file) if state_file else None
+        self.sheet_ids = {}  # sheet name -> sheet ID
+        self.header_cache = HeaderCache(header_file) if header_file else None
+        self.column_roles = {}  # sheet name -> {"name"|"phone"|"comment": index into A:C}
+        self.dedup = dedup
+        self.blacklist = load_blacklist_index(blacklist_file) if blacklist_file else None
+        self.contacts = ContactStore(contact_db) if contact_db else None
+        if self.contacts and self.blacklist is not None:
+            self.blacklist = self.blacklist | self.contacts.numbers_with("blocked")
+        self.offline = offline
+        if offline and not snapshot_file:
+            snapshot_file = SNAPSHOT_DB
+        self.snapshot = SnapshotCache(snapshot_file) if snapshot_file else None
+        self.date_index = {}  # sheet name -> {date: [rows]}, reused across date ranges
+        self.abc_columns = {}  # sheet name -> (data_start_row, A:C values) for the index
         self.spreadsheet_id = self.extract_spreadsheet_id(spreadsheet_url)
         self.gc = None
         self.spreadsheet = None
         self.today = datetime.now().date()
         self.today_str = self.today.strftime("%d-%m-%y")
+        self.api_calls = Counter()  # sheet name -> Sheets API requests made
+        self.log_buffer = threading.local()  # per-thread lines of the sheet being scanned
         
         print(f"=== Google Sheets Daily Report Generator ===")
         print(f"Target date: {self.today} ({self.today_str})")
@@ -21,20 +104,64 @@ class GoogleSheetsReportGenerator:
         
     def extract_spreadsheet_id(self, url):
         """Extract spreadsheet ID from Google Sheets URL"""
-        match = re.search(r'/spreadsheets/d/([a-zA-Z0-9-_]+)', url)
-        if match:
-            return match.group(1)
+        spreadsheet_id = extract_sheet_id(url)
+        if spreadsheet_id:
+            return spreadsheet_id
         else:
             raise ValueError("Invalid Google Sheets URL")
     
+    def log(self, message):
+        """print(), or keep the line while a scan_sheets() worker is scanning a sheet"""
+        lines = getattr(self.log_buffer, 'lines', None)
+        if lines is None:
+            print(message)
+        else:
+            lines.append(message)
+    
+    def scan_sheet_buffered(self, sheet_name):
+        """scan_sheet_for_today_data() with its output collected: (contacts, log lines)"""
+        self.log_buffer.lines = []
+        try:
+            with thread_profile():
+                return self.scan_sheet_for_today_data(sheet_name), self.log_buffer.lines
+        finally:
+            self.log_buffer.lines = None
+    
+    def is_rate_limited(self, error):
+        """True for 429 Too Many Requests (quota exceeded)"""
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None) == 429
+    
+    def call_api(self, key, request, *args):
+        """Send one Sheets API request through the shared limiter
+        
+        Counts it under api_calls[key] and retries 429 responses with
+        exponential backoff and full jitter.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            with span("quota wait"):
+                self.limiter.acquire()
+            with self.lock:
+                self.api_calls[key] += 1
+            try:
+                with span("sheets request"):
+                    return request(*args)
+            except gspread.exceptions.APIError as e:
+                if not self.is_rate_limited(e) or attempt == MAX_RETRIES:
+                    raise
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                self.log(f"  ! Rate limited while reading {key}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+    
     def authenticate(self):
         print("\n--- Authenticating with Google Sheets API ---")
         try:
-            creds, _ = default(scopes=[
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ])
-            self.gc = gspread.authorize(creds)
+            with span("authenticate"):
+                creds, _ = google_auth.default(scopes=[
+                    'https://www.googleapis.com/auth/spreadsheets',
+                    'https://www.googleapis.com/auth/drive'
+                ])
+                self.gc = gspread.authorize(creds)
             print("✓ Authenticated using gcloud application-default credentials")
         except Exception as e:
             print(f"✗ Authentication failed: {e}")
@@ -44,11 +171,13 @@ class GoogleSheetsReportGenerator:
         """Connect to the Google Spreadsheet"""
         print(f"\n--- Connecting to spreadsheet ---")
         try:
-            self.spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
+            self.spreadsheet = self.call_api(METADATA_KEY, self.gc.open_by_key, self.spreadsheet_id)
             print(f"✓ Connected to: {self.spreadsheet.title}")
             
             # List all sheets
-            sheet_names = [ws.title for ws in self.spreadsheet.worksheets()]
+            worksheets = self.call_api(METADATA_KEY, self.spreadsheet.worksheets)
+            self.sheet_ids = {ws.title: ws.id for ws in worksheets}
+            sheet_names = [ws.title for ws in worksheets]
             print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
             return sheet_names
             
@@ -57,21 +186,104 @@ class GoogleSheetsReportGenerator:
             raise
     
     def find_fc_column(self, worksheet):
-        """Find FC column in the worksheet header"""
-        print(f"  → Searching for FC column...")
+        """Find FC column in the worksheet header
+        
+        A cached position is checked with a one-cell read; the header block
+        is only searched when there is no cache entry or the check fails.
+        """
+        key = self.header_key(worksheet.title, worksheet.id)
+        layout = self.header_cache.get(key) if key else None
+        if layout:
+            cell = self.call_api(worksheet.title, worksheet.get_values,
+                                 f"{layout['fc_column']}{layout['header_row']}")
+            if self.is_fc_header(cell):
+                return self.use_layout(worksheet.title, layout)
+            self.log(f"  ! FC header is no longer at {layout['fc_column']}{layout['header_row']}")
+        
+        self.log(f"  → Searching for FC column...")
         
         # Get first few rows to find headers
-        header_data = worksheet.get_values('A1:CZ5')  # Check first 5 rows, up to column CZ
+        header_data = self.call_api(worksheet.title, worksheet.get_values, HEADER_RANGE)  # Check first 5 rows, up to column CZ
+        return self.learn_layout(worksheet.title, key, header_data)
+    
+    def header_key(self, sheet_name, sheet_id=None):
+        """Header cache key for a sheet, or None when the cache is off"""
+        if sheet_id is None:
+            sheet_id = self.sheet_ids.get(sheet_name)
+        if self.header_cache is None or sheet_id is None:
+            return None
+        return self.header_cache.key(self.spreadsheet_id, sheet_id)
+    
+    def is_fc_header(self, values):
+        """Does a one-cell read hold the FC header?"""
+        return bool(values and values[0] and str(values[0][0]).upper().strip() == "FC")
+    
+    def use_layout(self, sheet_name, layout):
+        """Header position from a validated cache entry"""
+        self.log(f"  ✓ FC column still at {layout['fc_column']} (header row {layout['header_row']})")
+        self.column_roles[sheet_name] = layout['roles']
+        return layout['fc_index'], layout['fc_column'], layout['header_row']
+    
+    def learn_layout(self, sheet_name, key, header_data):
+        """Search downloaded header rows and cache what was found"""
+        col_idx, col_letter, row_idx = self.find_fc_in_header(header_data)
+        header_cells = header_data[row_idx - 1] if row_idx <= len(header_data) else []
+        roles = column_roles(header_cells)
+        self.column_roles[sheet_name] = roles
+        if key:
+            found = col_idx <= len(header_cells) and str(header_cells[col_idx - 1]).upper().strip() == "FC"
+            with self.lock:
+                if found:
+                    self.header_cache.put(key, col_idx, col_letter, row_idx, roles)
+                else:
+                    self.header_cache.forget(key)
+        return col_idx, col_letter, row_idx
+    
+    def locate_headers(self, sheet_names):
+        """FC position of every sheet: {sheet name: (col_idx, col_letter, header_row)}
+        
+        One request reads the cached FC cell of known sheets and the header
+        block of the others; a second one is only needed for sheets whose
+        cached FC cell no longer matches.
+        """
+        keys = {name: self.header_key(name) for name in sheet_names}
+        layouts = {name: self.header_cache.get(key) if key else None for name, key in keys.items()}
+        cached = sum(1 for layout in layouts.values() if layout)
+        print(f"  → Fetching headers of {len(sheet_names)} sheets ({cached} cached, checked with one cell)...")
+        ranges = [self.sheet_range(name, f"{layouts[name]['fc_column']}{layouts[name]['header_row']}"
+                                   if layouts[name] else HEADER_RANGE)
+                  for name in sheet_names]
         
+        positions = {}
+        retry = []
+        for sheet_name, values in zip(sheet_names, self.batch_get_values(ranges)):
+            print(f"  {sheet_name}:")
+            if not layouts[sheet_name]:
+                positions[sheet_name] = self.learn_layout(sheet_name, keys[sheet_name], values)
+            elif self.is_fc_header(values):
+                positions[sheet_name] = self.use_layout(sheet_name, layouts[sheet_name])
+            else:
+                print(f"  ! FC header moved, rescanning the header rows")
+                retry.append(sheet_name)
+        
+        if retry:
+            headers = self.batch_get_values([self.sheet_range(name, HEADER_RANGE) for name in retry])
+            for sheet_name, header_data in zip(retry, headers):
+                print(f"  {sheet_name}:")
+                positions[sheet_name] = self.learn_layout(sheet_name, keys[sheet_name], header_data)
+        return positions
+    
+    def find_fc_in_header(self, header_data):
+        """Find FC column in already downloaded header rows"""
         for row_idx, row in enumerate(header_data, 1):
             for col_idx, cell_value in enumerate(row, 1):
                 if cell_value and str(cell_value).upper().strip() == "FC":
                     col_letter = self.number_to_column_letter(col_idx)
-                    print(f"  ✓ Found FC column at {col_letter} (column {col_idx}, header row {row_idx})")
+                    self.log(f"  ✓ Found FC column at {col_letter} (column {col_idx}, header row {row_idx})")
                     return col_idx, col_letter, row_idx
         
         # Fallback
-        print("  ! FC header not found, using default column 83 (CG)")
+        self.log("  ! FC header not found, using default column 83 (CG)")
         return 83, 'CG', 1
     
     def number_to_column_letter(self, col_num):
@@ -83,108 +295,454 @@ class GoogleSheetsReportGenerator:
             col_num //= 26
         return result
     
+    def group_rows(self, rows):
+        """Group sorted row numbers into runs of consecutive rows [(first, last), ...]"""
+        runs = []
+        for row in rows:
+            if runs and row == runs[-1][1] + 1:
+                runs[-1] = (runs[-1][0], row)
+            else:
+                runs.append((row, row))
+        return runs
+    
+    def fetch_rows(self, worksheet, sheet_name, rows):
+        """Fetch A:C for the given rows with as few API calls as possible.
+        
+        Either one contiguous A{first}:C{last} read sliced locally, or batch_get
+        of the consecutive runs, whichever needs fewer requests (ties go to the
+        smaller download).
+        """
+        runs = self.group_rows(sorted(rows))
+        first, last = runs[0][0], runs[-1][1]
+        batch_calls = -(-len(runs) // MAX_RANGES_PER_BATCH)
+        spread = last - first + 1
+        
+        if batch_calls > 1 or spread <= len(rows) * MAX_SPREAD_FACTOR:
+            self.log(f"  → Fetching A{first}:C{last} in one read ({spread} rows for {len(rows)} matches)...")
+            values = self.call_api(sheet_name, worksheet.get_values, f"A{first}:C{last}")
+            return {row: values[row - first] if row - first < len(values) else [] for row in rows}
+        
+        self.log(f"  → Fetching {len(runs)} row ranges in {batch_calls} batch request(s)...")
+        ranges = [f"A{start}:C{end}" for start, end in runs]
+        result = {}
+        for i in range(0, len(ranges), MAX_RANGES_PER_BATCH):
+            value_ranges = self.call_api(sheet_name, worksheet.batch_get, ranges[i:i + MAX_RANGES_PER_BATCH])
+            for (start, end), values in zip(runs[i:i + MAX_RANGES_PER_BATCH], value_ranges):
+                for row in range(start, end + 1):
+                    result[row] = values[row - start] if row - start < len(values) else []
+        return result
+    
     def parse_date_value(self, cell_value):
         """Parse various date formats to date object"""
-        if not cell_value:
-            return None
-            
-        if isinstance(cell_value, (datetime, date)):
-            return cell_value if isinstance(cell_value, date) else cell_value.date()
-        
-        if isinstance(cell_value, str):
-            cell_value = cell_value.strip()
-            # Try common date formats
-            for fmt in ["%d-%m-%y", "%d/%m/%y", "%d.%m.%y", "%Y-%m-%d", 
-                       "%d-%m-%Y", "%d/%m/%Y", "%m/%d/%y", "%m/%d/%Y"]:
-                try:
-                    return datetime.strptime(cell_value, fmt).date()
-                except ValueError:
-                    continue
-        
-        return None
+        return parse_date_value(cell_value)
     
     def scan_sheet_for_today_data(self, sheet_name):
         """Efficiently scan a sheet for today's data"""
-        print(f"\n--- Processing sheet: {sheet_name} ---")
+        self.log(f"\n--- Processing sheet: {sheet_name} ---")
         
         try:
-            worksheet = self.spreadsheet.worksheet(sheet_name)
-            print(f"  → Sheet loaded successfully")
+            worksheet = self.call_api(sheet_name, self.spreadsheet.worksheet, sheet_name)
+            self.log(f"  → Sheet loaded successfully")
             
             # Find FC column
             fc_col_num, fc_col_letter, header_row = self.find_fc_column(worksheet)
             data_start_row = header_row + 1
+            key = self.state_key(sheet_name)
+            entry, start = self.resume_scan(key, fc_col_letter, data_start_row)
             
-            # Get FC column data efficiently
-            print(f"  → Fetching FC column data starting from row {data_start_row}...")
-            fc_range = f"{fc_col_letter}{data_start_row}:{fc_col_letter}"
-            fc_values = worksheet.get_values(fc_range)
-            
-            if not fc_values:
-                print(f"  ! No data found in FC column")
-                return []
-            
-            print(f"  → Got {len(fc_values)} cells from FC column")
+            # Get FC column data efficiently (only new rows if the sheet was scanned today)
+            self.log(f"  → Fetching FC column data starting from row {start}...")
+            fc_range = f"{fc_col_letter}{start}:{fc_col_letter}"
+            fc_values = self.call_api(sheet_name, worksheet.get_values, fc_range)
+            self.log(f"  → Got {len(fc_values)} cells from FC column")
             
             # Find rows with today's date
-            today_rows = []
-            for idx, row in enumerate(fc_values):
-                if row:  # Non-empty row
-                    cell_value = row[0] if row else None
-                    if cell_value:
-                        parsed_date = self.parse_date_value(cell_value)
-                        if parsed_date == self.today:
-                            actual_row = data_start_row + idx
-                            today_rows.append(actual_row)
-                            print(f"  ✓ Found today's date in row {actual_row}: {cell_value}")
-            
+            today_rows = self.match_fc_values(key, entry, fc_values, start, fc_col_letter, data_start_row)
+            if today_rows is None:
+                fc_range = f"{fc_col_letter}{data_start_row}:{fc_col_letter}"
+                fc_values = self.call_api(sheet_name, worksheet.get_values, fc_range)
+                today_rows = self.match_fc_values(key, None, fc_values, data_start_row, fc_col_letter, data_start_row)
             if not today_rows:
-                print(f"  ! No entries found for today ({self.today_str})")
                 return []
             
-            print(f"  → Found {len(today_rows)} rows with today's date")
-            
-            # Efficiently fetch Name, Phone, Comment for today's rows
-            contacts_data = []
+            # Fetch Name, Phone, Comment for all of today's rows at once
+            row_values = self.fetch_rows(worksheet, sheet_name, today_rows)
+            contacts_data = self.build_contacts(sheet_name, today_rows, row_values)
+            self.log(f"  → API calls for {sheet_name}: {self.api_calls[sheet_name]}")
+            return contacts_data
             
-            for row_num in today_rows:
-                # Fetch A, B, C columns for this specific row
-                range_name = f"A{row_num}:C{row_num}"
-                print(f"  → Fetching data from {range_name}...")
-                
-                row_data = worksheet.get_values(range_name)
-                if row_data and row_data[0]:
-                    data_row = row_data[0]
-                    name = data_row[0] if len(data_row) > 0 else ""
-                    phone = data_row[1] if len(data_row) > 1 else ""
-                    comment = data_row[2] if len(data_row) > 2 else ""
-                    
-                    contact = {
-                        'sheet': sheet_name,
-                        'row': row_num,
-                        'name': name,
-                        'phone': phone,
-                        'comment': comment,
-                        'date': self.today_str
-                    }
-                    contacts_data.append(contact)
-                    
-                    print(f"    ✓ Row {row_num}: {name} | {phone} | {comment}")
+        except Exception as e:
+            self.log(f"  ✗ Error processing sheet {sheet_name}: {e}")
+            return []
+    
+    def state_key(self, sheet_name):
+        """Scan state key for a sheet, or None when incremental scans are off"""
+        sheet_id = self.sheet_ids.get(sheet_name)
+        if self.scan_state is None or sheet_id is None:
+            return None
+        return self.scan_state.key(self.spreadsheet_id, sheet_id)
+    
+    def resume_scan(self, key, fc_col_letter, data_start_row):
+        """(stored high-water mark or None, first FC row to fetch)"""
+        entry = None
+        if key:
+            entry = self.scan_state.lookup(key, self.today_str, fc_col_letter, data_start_row)
+        if entry is None:
+            return None, data_start_row
+        self.log(f"  → Scanned up to row {entry['last_row']} earlier today, fetching new rows only")
+        return entry, self.scan_state.resume_row(entry, data_start_row)
+    
+    def match_fc_values(self, key, entry, fc_values, start, fc_col_letter, data_start_row):
+        """Today's rows from FC values fetched from row `start`
+        
+        With a stored entry the first cells are the previous scan's tail;
+        returns None if they changed, so the caller rescans the whole column.
+        """
+        cells = [row[0] if row else "" for row in fc_values]
+        if entry is None:
+            today_rows = self.find_today_rows(fc_values, start)
+        elif not self.scan_state.tail_matches(entry, cells, start):
+            self.log(f"  ! Rows above the high-water mark changed, rescanning the whole column")
+            return None
+        else:
+            tail_len = entry['last_row'] - start + 1
+            self.log(f"  → {len(cells) - tail_len} new rows since the last scan")
+            today_rows = entry['rows'] + self.find_today_rows(fc_values[tail_len:], entry['last_row'] + 1)
+        
+        if key:
+            with self.lock:
+                self.scan_state.record(key, self.today_str, fc_col_letter, data_start_row,
+                                       cells, start, today_rows)
+        return today_rows
+    
+    def find_today_rows(self, fc_values, data_start_row):
+        """Return sheet row numbers whose FC cell is today's date"""
+        today_rows = []
+        cells = [row[0] if row else None for row in fc_values]
+        with span("parse dates"):
+            parsed_dates = parse_date_column(cells)
+        for idx, parsed_date in enumerate(parsed_dates):
+            if parsed_date == self.today:
+                actual_row = data_start_row + idx
+                today_rows.append(actual_row)
+                self.log(f"  ✓ Found today's date in row {actual_row}: {cells[idx]}")
+        
+        if not today_rows:
+            self.log(f"  ! No entries found for today ({self.today_str})")
+        else:
+            self.log(f"  → Found {len(today_rows)} rows with today's date")
+        return today_rows
+    
+    def build_contacts(self, sheet_name, today_rows, row_values):
+        """Turn fetched A:C values (row number -> cells) into contact dicts"""
+        contacts_data = []
+        for row_num in today_rows:
+            data_row = row_values.get(row_num)
+            if data_row:
+                contact = self.make_contact(sheet_name, row_num, data_row, self.today_str)
+                contacts_data.append(contact)
                 
-                # Small delay to avoid rate limits
-                time.sleep(0.1)
+                self.log(f"    ✓ Row {row_num}: {contact['name']} | {contact['phone']} | {contact['comment']}")
+        
+        self.log(f"  ✓ Extracted {len(contacts_data)} contacts from {sheet_name}")
+        return contacts_data
+    
+    def make_contact(self, sheet_name, row_num, data_row, date_str):
+        """Contact dict from the A:C cells of one row"""
+        roles = self.column_roles.get(sheet_name, DEFAULT_ROLES)
+        name, phone, comment = (data_row[roles[role]] if len(data_row) > roles[role] else ""
+                                for role in ("name", "phone", "comment"))
+        return {
+            'sheet': sheet_name,
+            'row': row_num,
+            'name': name,
+            'phone': phone,
+            'comment': comment,
+            'date': date_str
+        }
+    
+    def sheet_range(self, sheet_name, cell_range):
+        """A1 range qualified with a quoted sheet name, e.g. 'Mike''s'!A1:C"""
+        return "'{}'!{}".format(sheet_name.replace("'", "''"), cell_range)
+    
+    def batch_get_values(self, ranges):
+        """One values_batch_get request; returns the values of each range in order"""
+        response = self.call_api(BATCH_SCAN_KEY, self.spreadsheet.values_batch_get, ranges)
+        return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+    
+    def scan_all_sheets(self, sheet_names):
+        """Scan every sheet with two HTTP requests in total
+        
+        1. Header blocks of all sheets (to locate the FC columns)
+        2. FC column and A:C of all sheets (from the high-water mark when
+           the sheet was already scanned today)
+        A third request rescans sheets whose rows above the mark changed.
+        """
+        print(f"\n--- Scanning {len(sheet_names)} sheets in batch mode ---")
+        if not sheet_names:
+            return []
+        
+        positions = self.locate_headers(sheet_names)
+        
+        layouts = []
+        for sheet_name in sheet_names:
+            print(f"\n--- Processing sheet: {sheet_name} ---")
+            fc_col_num, fc_col_letter, header_row = positions[sheet_name]
+            data_start_row = header_row + 1
+            key = self.state_key(sheet_name)
+            entry, start = self.resume_scan(key, fc_col_letter, data_start_row)
+            layouts.append((sheet_name, key, entry, start, fc_col_letter, data_start_row))
+        
+        print(f"\n  → Fetching FC and A:C columns of all sheets...")
+        contacts, rescans = self.fetch_and_match(layouts)
+        if rescans:
+            print(f"\n  → Rescanning {len(rescans)} changed sheet(s)...")
+            full_layouts = [(sheet_name, key, None, data_start_row, fc_col_letter, data_start_row)
+                            for sheet_name, key, _, _, fc_col_letter, data_start_row in rescans]
+            contacts.update(self.fetch_and_match(full_layouts)[0])
+        
+        all_contacts = []
+        for sheet_name in sheet_names:
+            all_contacts.extend(contacts[sheet_name])
+        print(f"\n  → API calls for all {len(sheet_names)} sheets: {self.api_calls[BATCH_SCAN_KEY]}")
+        return all_contacts
+    
+    def fetch_and_match(self, layouts):
+        """One request for the FC and A:C ranges of every layout
+        
+        Returns ({sheet name: contacts}, layouts that need a full rescan).
+        """
+        ranges = []
+        for sheet_name, key, entry, start, fc_col_letter, data_start_row in layouts:
+            # Rows that matched earlier today are re-read so edits to A:C show up
+            abc_start = min([start] + (entry['rows'] if entry else []))
+            ranges.append(self.sheet_range(sheet_name, f"{fc_col_letter}{start}:{fc_col_letter}"))
+            ranges.append(self.sheet_range(sheet_name, f"A{abc_start}:C"))
+        values = self.batch_get_values(ranges)
+        
+        contacts = {}
+        rescans = []
+        for i, layout in enumerate(layouts):
+            sheet_name, key, entry, start, fc_col_letter, data_start_row = layout
+            print(f"\n--- Matching rows in sheet: {sheet_name} ---")
+            fc_values, abc_values = values[2 * i], values[2 * i + 1]
+            print(f"  → Got {len(fc_values)} cells from FC column")
+            today_rows = self.match_fc_values(key, entry, fc_values, start, fc_col_letter, data_start_row)
+            if today_rows is None:
+                rescans.append(layout)
+                continue
+            abc_start = min([start] + (entry['rows'] if entry else []))
+            row_values = {row: abc_values[row - abc_start]
+                          for row in today_rows if row - abc_start < len(abc_values)}
+            contacts[sheet_name] = self.build_contacts(sheet_name, today_rows, row_values)
+        return contacts, rescans
+    
+    def fetch_columns(self, sheet_names):
+        """Full FC and A:C columns of every sheet in two requests
+        
+        Returns {sheet name: (data_start_row, fc_values, abc_values)}.
+        """
+        positions = self.locate_headers(sheet_names)
+        
+        starts = []
+        ranges = []
+        for sheet_name in sheet_names:
+            fc_col_num, fc_col_letter, header_row = positions[sheet_name]
+            starts.append(header_row + 1)
+            ranges.append(self.sheet_range(sheet_name, f"{fc_col_letter}{header_row + 1}:{fc_col_letter}"))
+            ranges.append(self.sheet_range(sheet_name, f"A{header_row + 1}:C"))
+        
+        print(f"  → Fetching FC and A:C columns...")
+        values = self.batch_get_values(ranges)
+        return {sheet_name: (starts[i], values[2 * i], values[2 * i + 1])
+                for i, sheet_name in enumerate(sheet_names)}
+    
+    def contacts_from_columns(self, sheet_name, data_start_row, fc_values, abc_values):
+        """Today's contacts from full FC and A:C columns (live or from a snapshot)"""
+        print(f"\n--- Matching rows in sheet: {sheet_name} ---")
+        print(f"  → Got {len(fc_values)} cells from FC column")
+        today_rows = self.find_today_rows(fc_values, data_start_row)
+        row_values = {row: abc_values[row - data_start_row]
+                      for row in today_rows if row - data_start_row < len(abc_values)}
+        return self.build_contacts(sheet_name, today_rows, row_values)
+    
+    def scan_with_snapshot(self, sheet_names):
+        """Today's contacts from snapshot_columns"""
+        columns = self.snapshot_columns(sheet_names)
+        all_contacts = []
+        for sheet_name in sheet_names:
+            all_contacts.extend(self.contacts_from_columns(sheet_name, *columns[sheet_name]))
+        return all_contacts
+    
+    def snapshot_columns(self, sheet_names):
+        """Serve sheets from the snapshot if the spreadsheet is unchanged, else fetch and store them"""
+        print(f"\n--- Checking snapshot in {self.snapshot.db_path} ---")
+        modified_time = self.call_api(METADATA_KEY, self.spreadsheet.get_lastUpdateTime)
+        columns = {}
+        if self.snapshot.modified_time(self.spreadsheet_id) == modified_time:
+            columns = self.snapshot.load(self.spreadsheet_id)
+        
+        missing = [name for name in sheet_names if name not in columns]
+        if missing:
+            print(f"  → Spreadsheet modified {modified_time}, fetching {len(missing)} sheet(s)...")
+            columns.update(self.fetch_columns(missing))
+            self.snapshot.save(self.spreadsheet_id, modified_time, columns)
+        else:
+            print(f"  ✓ Unchanged since {modified_time}, reading all sheets from the snapshot")
+        return columns
+    
+    def offline_columns(self):
+        """All columns of the last snapshot"""
+        columns = self.snapshot.load(self.spreadsheet_id)
+        if not columns:
+            raise ValueError(f"No snapshot of {self.spreadsheet_id} in {self.snapshot.db_path}")
+        print(f"\n--- Offline: using snapshot of {self.snapshot.modified_time(self.spreadsheet_id)} ---")
+        return columns
+    
+    def scan_offline(self):
+        """Sheet selection and contacts from the last snapshot only"""
+        columns = self.offline_columns()
+        sheets_to_process = self.get_sheets_to_process(list(columns))
+        all_contacts = []
+        for sheet_name in sheets_to_process:
+            all_contacts.extend(self.contacts_from_columns(sheet_name, *columns[sheet_name]))
+        return sheets_to_process, self.aggregate(all_contacts)
+    
+    def aggregate(self, contacts):
+        """Merge contacts with the same canonical phone number (if dedup is on)"""
+        if not self.dedup:
+            return contacts
+        with span("aggregate contacts"):
+            merged = aggregate_contacts(contacts, self.blacklist)
+        print(f"\n--- Merged {len(contacts)} contacts into {len(merged)} unique phone numbers ---")
+        flagged = [contact for contact in merged if contact['blacklisted']]
+        for contact in flagged:
+            print(f"  ! Blacklisted: {contact['name']} ({contact['phone']}) - {contact['sheet']}")
+        return merged
+    
+    def build_date_index(self, sheet_names, columns=None):
+        """Scan each FC column once into {date: [rows]} per sheet
+        
+        Sheets already indexed in this session are not fetched again, so
+        several date ranges can be reported from one scan.
+        """
+        missing = [name for name in sheet_names if name not in self.date_index]
+        if not missing:
+            return
+        if columns is None:
+            print(f"\n--- Indexing FC dates of {len(missing)} sheets ---")
+            columns = self.snapshot_columns(missing) if self.snapshot else self.fetch_columns(missing)
+        for sheet_name in missing:
+            data_start_row, fc_values, abc_values = columns[sheet_name]
+            index = defaultdict(list)
+            cells = [row[0] if row else None for row in fc_values]
+            with span("parse dates"):
+                days = parse_date_column(cells)
+            for offset, day in enumerate(days):
+                if day is not None:
+                    index[day].append(data_start_row + offset)
+            self.date_index[sheet_name] = index
+            self.abc_columns[sheet_name] = (data_start_row, abc_values)
+            print(f"  ✓ {sheet_name}: {sum(len(rows) for rows in index.values())} dated rows, {len(index)} days")
+        if self.header_cache and not self.offline:
+            self.header_cache.save()
+    
+    def range_report(self, sheet_names, first_day, last_day):
+        """Contacts per day and counts per sheet per day from the date index
+        
+        Returns ({day: [contacts]}, {sheet name: Counter(day -> contacts)}).
+        """
+        self.build_date_index(sheet_names)
+        per_day = {}
+        per_sheet = {sheet_name: Counter() for sheet_name in sheet_names}
+        day = first_day
+        while day <= last_day:
+            contacts = []
+            for sheet_name in sheet_names:
+                data_start_row, abc_values = self.abc_columns[sheet_name]
+                for row_num in self.date_index[sheet_name].get(day, []):
+                    offset = row_num - data_start_row
+                    data_row = abc_values[offset] if offset < len(abc_values) else []
+                    if data_row:
+                        contacts.append(self.make_contact(sheet_name, row_num, data_row, day.strftime("%d-%m-%y")))
+                        per_sheet[sheet_name][day] += 1
+            per_day[day] = contacts
+            day += timedelta(days=1)
+        return per_day, per_sheet
+    
+    def print_range_report(self, per_day, per_sheet):
+        """Per-day contact lists and a sheet x day table of counts"""
+        for day, contacts in per_day.items():
+            print(f"\n=== {day.strftime('%d-%m-%y')}: {len(contacts)} contacts ===")
+            for contact in contacts:
+                print(f"  • {contact['name']} ({contact['phone']}) - {contact['sheet']}")
+        
+        days = list(per_day)
+        width = max([len("Sheet")] + [len(name) for name in per_sheet])
+        print(f"\n=== Contacts per sheet per day ===")
+        print(f"{'Sheet':<{width}} " + " ".join(f"{day.strftime('%d-%m'):>5}" for day in days) + "  Total")
+        for sheet_name, counts in per_sheet.items():
+            print(f"{sheet_name:<{width}} " + " ".join(f"{counts[day]:>5}" for day in days)
+                  + f"  {sum(counts.values()):>5}")
+        totals = [sum(counts[day] for counts in per_sheet.values()) for day in days]
+        print(f"{'Total':<{width}} " + " ".join(f"{total:>5}" for total in totals) + f"  {sum(totals):>5}")
+    
+    def generate_range_report(self, first_day, last_day):
+        """Report every day from first_day to last_day from a single scan"""
+        start_time = time.time()
+        
+        try:
+            if self.offline:
+                columns = self.offline_columns()
+                sheets_to_process = self.get_sheets_to_process(list(columns))
+                self.build_date_index(sheets_to_process, columns)
+            else:
+                self.authenticate()
+                all_sheets = self.connect_to_spreadsheet()
+                sheets_to_process = self.get_sheets_to_process(all_sheets)
             
-            print(f"  ✓ Extracted {len(contacts_data)} contacts from {sheet_name}")
-            return contacts_data
+            per_day, per_sheet = self.range_report(sheets_to_process, first_day, last_day)
+            found = sum(len(contacts) for contacts in per_day.values())
+            if self.dedup:
+                unique = len(self.aggregate([c for contacts in per_day.values() for c in contacts]))
+                per_day = {day: aggregate_contacts(contacts, self.blacklist) for day, contacts in per_day.items()}
+            self.print_range_report(per_day, per_sheet)
             
+            elapsed = time.time() - start_time
+            print(f"\n=== SUMMARY ===")
+            print(f"✓ Processed {len(sheets_to_process)} sheets for {len(per_day)} days")
+            print(f"✓ Found {found} contacts")
+            if self.dedup:
+                print(f"✓ {unique} unique phone numbers in the range")
+            print(f"✓ Sheets API calls: {sum(self.api_calls.values())}")
+            print(f"⏱ Total time: {elapsed:.2f} seconds")
+            return per_day, per_sheet
+        
         except Exception as e:
-            print(f"  ✗ Error processing sheet {sheet_name}: {e}")
-            return []
+            print(f"✗ Script failed: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def scan_sheets(self, sheet_names):
+        """Scan sheets concurrently; contacts are merged in sheet order"""
+        all_contacts = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # map() yields results in input order, whichever sheet finishes first, so
+            # each sheet's lines are printed together and in sheet order
+            for contacts, lines in pool.map(self.scan_sheet_buffered, sheet_names):
+                print('\n'.join(lines))
+                all_contacts.extend(contacts)
+        print(f"  → Running total: {len(all_contacts)} contacts")
+        return all_contacts
+    
+    def available_sheets(self, all_sheets):
+        """Sheets that can hold contacts (everything but Daily Report and Approved)"""
+        excluded_sheets = ["Daily Report", "Approved"]
+        return [sheet for sheet in all_sheets if sheet not in excluded_sheets]
     
     def get_sheets_to_process(self, all_sheets):
         """Get list of sheets to process (exclude Daily Report and Approved)"""
-        excluded_sheets = ["Daily Report", "Approved"]
-        available_sheets = [sheet for sheet in all_sheets if sheet not in excluded_sheets]
+        available_sheets = self.available_sheets(all_sheets)
         
         print(f"\n=== Available sheets to scan ===")
         for i, sheet_name in enumerate(available_sheets, 1):
@@ -207,28 +765,64 @@ class GoogleSheetsReportGenerator:
                 print("Invalid input. Processing all sheets...")
                 return available_sheets
     
+    def report_key(self, row):
+        """(source sheet, source row) of a Daily Report row, as strings"""
+        row = self.pad_report_row(row)
+        return str(row[4]), str(row[5])
+    
+    def pad_report_row(self, row):
+        """Report row as strings, padded to the header width (the API drops trailing blanks)"""
+        return [str(cell) for cell in row] + [""] * (len(REPORT_HEADERS) - len(row))
+    
+    def arrange_report_rows(self, existing, data_rows):
+        """Order new rows so unchanged contacts keep their place in the sheet
+        
+        Contacts already in the report stay in their current order, contacts
+        that are gone are dropped, new contacts are appended.
+        Returns (rows, added, removed).
+        """
+        by_key = {self.report_key(row): row for row in data_rows}
+        kept = []
+        seen = set()
+        for row in existing:
+            key = self.report_key(row)
+            if key in by_key and key not in seen:
+                kept.append(by_key[key])
+                seen.add(key)
+        added = [row for row in data_rows if self.report_key(row) not in seen]
+        return kept + added, len(added), len(existing) - len(kept)
+    
+    def diff_report(self, target, current):
+        """Row ranges to write: [(first sheet row, values), ...]
+        
+        Rows that already hold the target values are skipped; rows below the
+        target are overwritten with blanks, which trims leftovers.
+        """
+        blank = [""] * len(REPORT_HEADERS)
+        changed = []
+        for i in range(max(len(target), len(current))):
+            want = target[i] if i < len(target) else blank
+            have = current[i] if i < len(current) else blank
+            if self.pad_report_row(want) != self.pad_report_row(have):
+                changed.append(i + 1)
+        return [(first, [target[i - 1] if i <= len(target) else blank for i in range(first, last + 1)])
+                for first, last in self.group_rows(changed)]
+    
     def write_to_daily_report(self, all_contacts):
-        """Write collected contacts to Daily Report sheet"""
+        """Write collected contacts to Daily Report sheet
+        
+        Reads the sheet once and writes only the rows that differ, in a
+        single values_batch_update, so the report is never empty mid-update.
+        With no contacts the data rows are blanked (the header stays), so
+        an earlier day's rows do not linger.
+        Returns True if anything was written.
+        """
         print(f"\n--- Writing to Daily Report sheet ---")
         
         if not all_contacts:
-            print("! No contacts to write")
-            return
+            print("! No contacts for today, clearing the report rows")
         
         try:
-            # Get Daily Report sheet
-            daily_report_sheet = self.spreadsheet.worksheet("Daily Report")
-            print(f"  ✓ Connected to Daily Report sheet")
-            
-            # Clear existing data (keep headers in row 1)
-            print(f"  → Clearing existing data...")
-            daily_report_sheet.clear()
-            
-            # Write headers
-            headers = ["Name", "Phone", "Comment", "Date", "Source Sheet", "Source Row"]
-            daily_report_sheet.append_row(headers)
-            print(f"  ✓ Added headers")
-            
             # Prepare data for batch write
             data_rows = []
             for contact in all_contacts:
@@ -242,45 +836,151 @@ class GoogleSheetsReportGenerator:
                 ]
                 data_rows.append(row)
             
-            # Batch write all data
-            if data_rows:
-                print(f"  → Writing {len(data_rows)} contacts...")
-                daily_report_sheet.append_rows(data_rows)
-                print(f"  ✓ Successfully wrote {len(data_rows)} contacts to Daily Report")
+            # Current contents of the Daily Report
+            report_range = self.sheet_range(REPORT_SHEET, "A:F")
+            current = self.call_api(REPORT_SHEET, self.spreadsheet.values_get, report_range).get('values', [])
+            print(f"  ✓ Read {max(len(current) - 1, 0)} existing rows from Daily Report")
+            
+            with span("diff report"):
+                rows, added, removed = self.arrange_report_rows(current[1:], data_rows)
+                updates = self.diff_report([REPORT_HEADERS] + rows, current)
+            if not updates:
+                print(f"  ✓ Daily Report already up to date")
+                return False
+            
+            changed = sum(len(values) for first, values in updates)
+            print(f"  → Writing {changed} changed rows ({added} new, {removed} removed contacts)...")
+            self.call_api(REPORT_SHEET, self.spreadsheet.values_batch_update, {
+                "valueInputOption": "RAW",
+                "data": [{"range": self.sheet_range(REPORT_SHEET, f"A{first}:F{first + len(values) - 1}"),
+                          "values": values}
+                         for first, values in updates],
+            })
+            print(f"  ✓ Daily Report now has {len(rows)} contacts")
+            return True
             
         except Exception as e:
             print(f"  ✗ Error writing to Daily Report: {e}")
+            return False
+    
+    def last_update_time(self):
+        """Drive modifiedTime of the spreadsheet (one metadata request)"""
+        return self.call_api(METADATA_KEY, self.spreadsheet.get_lastUpdateTime)
+    
+    def report_written(self, before, seen):
+        """modifiedTime to treat as seen after our own write, read right `before` it; `seen` if edited since"""
+        if before != seen:
+            return seen
+        modified_time = self.last_update_time()
+        if self.snapshot and self.snapshot.modified_time(self.spreadsheet_id) == before:
+            self.snapshot.touch(self.spreadsheet_id, modified_time)
+        return modified_time
+    
+    def record_reported(self, all_contacts):
+        """Record the report's contacts in the shared contact-state store (if any)"""
+        if not self.contacts or not all_contacts:
+            return
+        with span("record contacts"):
+            added = import_report_contacts(self.contacts, all_contacts)
+        print(f"  ✓ {added} newly reported numbers recorded in {self.contacts.db_path}")
+    
+    def scan(self, sheet_names):
+        """Today's contacts from the selected sheets, in the configured scan mode"""
+        with span("scan sheets"):
+            if self.snapshot:
+                all_contacts = self.scan_with_snapshot(sheet_names)
+            elif self.scan_mode == "batch":
+                all_contacts = self.scan_all_sheets(sheet_names)
+            else:
+                all_contacts = self.scan_sheets(sheet_names)
+        if self.scan_state:
+            self.scan_state.save()
+        if self.header_cache:
+            self.header_cache.save()
+        return self.aggregate(all_contacts)
+    
+    def watch(self, sheet_names=None, min_interval=WATCH_MIN_INTERVAL, max_interval=WATCH_MAX_INTERVAL,
+              sleep=time.sleep, polls=None):
+        """Keep the Daily Report current until Ctrl+C (or `polls` polls), rescanning only after a change"""
+        self.authenticate()
+        all_sheets = self.connect_to_spreadsheet()
+        sheet_names = sheet_names or self.available_sheets(all_sheets)
+        missing = [name for name in sheet_names if name not in all_sheets]
+        if missing:
+            raise ValueError(f"Sheets not found: {', '.join(missing)}")
+        print(f"\n=== Watching {len(sheet_names)} sheets ===")
+        print(', '.join(sheet_names))
+        
+        last_seen = None
+        report_day = None
+        interval = min_interval
+        poll = 0
+        try:
+            while polls is None or poll < polls:
+                poll += 1
+                try:
+                    self.today = datetime.now().date()
+                    self.today_str = self.today.strftime("%d-%m-%y")
+                    modified_time = self.call_api(METADATA_KEY, self.spreadsheet.get_lastUpdateTime)
+                    if modified_time == last_seen and self.today == report_day:
+                        interval = min(max_interval, interval * WATCH_BACKOFF)
+                        print(f"[{datetime.now():%H:%M:%S}] No changes, next check in {interval:.0f}s")
+                    else:
+                        print(f"\n[{datetime.now():%H:%M:%S}] Spreadsheet changed ({modified_time}), updating...")
+                        all_contacts = self.scan(sheet_names)
+                        self.record_reported(all_contacts)
+                        before = self.last_update_time()
+                        if self.write_to_daily_report(all_contacts):
+                            # Our own write bumps modifiedTime; don't treat it as a change
+                            modified_time = self.report_written(before, modified_time)
+                        last_seen = modified_time
+                        report_day = self.today
+                        interval = min_interval
+                        print(f"✓ {len(all_contacts)} contacts for {self.today_str}, "
+                              f"{sum(self.api_calls.values())} API calls so far")
+                except Exception as e:
+                    print(f"✗ Poll failed: {e}")
+                if polls is None or poll < polls:
+                    sleep(interval)
+        except KeyboardInterrupt:
+            print(f"\n=== Stopped watching after {poll} polls ===")
     
     def generate_report(self):
         """Main function to generate the daily report"""
         start_time = time.time()
         
         try:
-            # Authenticate and connect
-            self.authenticate()
-            all_sheets = self.connect_to_spreadsheet()
-            
-            # Get sheets to process
-            sheets_to_process = self.get_sheets_to_process(all_sheets)
-            print(f"\n=== Will process {len(sheets_to_process)} sheets ===")
-            print(', '.join(sheets_to_process))
-            
-            # Process each sheet
-            all_contacts = []
-            for sheet_name in sheets_to_process:
-                contacts = self.scan_sheet_for_today_data(sheet_name)
-                all_contacts.extend(contacts)
-                print(f"  → Running total: {len(all_contacts)} contacts")
-            
-            # Write to Daily Report sheet
-            self.write_to_daily_report(all_contacts)
+            if self.offline:
+                sheets_to_process, all_contacts = self.scan_offline()
+            else:
+                # Authenticate and connect
+                self.authenticate()
+                all_sheets = self.connect_to_spreadsheet()
+                
+                # Get sheets to process
+                sheets_to_process = self.get_sheets_to_process(all_sheets)
+                print(f"\n=== Will process {len(sheets_to_process)} sheets ===")
+                print(', '.join(sheets_to_process))
+                
+                # Process each sheet
+                all_contacts = self.scan(sheets_to_process)
+                
+                # Write to Daily Report sheet; the snapshot only follows our own write
+                before = self.last_update_time() if self.snapshot else None
+                if self.write_to_daily_report(all_contacts) and self.snapshot:
+                    self.report_written(before, self.snapshot.modified_time(self.spreadsheet_id))
+                self.record_reported(all_contacts)
             
             # Summary
             elapsed = time.time() - start_time
             print(f"\n=== SUMMARY ===")
             print(f"✓ Processed {len(sheets_to_process)} sheets")
             print(f"✓ Found {len(all_contacts)} contacts for {self.today_str}")
-            print(f"✓ Updated Daily Report sheet")
+            if self.offline:
+                print(f"! Offline: Daily Report sheet not updated")
+            else:
+                print(f"✓ Updated Daily Report sheet")
+            print(f"✓ Sheets API calls: {sum(self.api_calls.values())}")
             print(f"⏱ Total time: {elapsed:.2f} seconds")
             
             if all_contacts:
@@ -294,12 +994,46 @@ class GoogleSheetsReportGenerator:
             traceback.print_exc()
 
 
+def load_watch_config(path):
+    """Watch mode settings from a JSON file, e.g.
+    
+    {"spreadsheet_url": "https://docs.google.com/spreadsheets/d/.../edit",
+     "sheets": ["Mike", "Anna"],           (omit for all sheets)
+     "min_interval": 30, "max_interval": 600,
+     "blacklist_file": "blacklist_cache.txt",    (optional, flags blacklisted contacts)
+     "contact_db": "contacts.db"}                (optional, records reported numbers)
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    if "spreadsheet_url" not in config:
+        raise ValueError(f"{path}: 'spreadsheet_url' is required")
+    return config
+
+
+@profiled("report_generator")
 def main():
     # Your Google Sheets URL
     spreadsheet_url = "https://docs.google.com/spreadsheets/d/1wA3ktIPXsidmNe8IVR24Rk_kP78wZ9giVlhnDu104Fg/edit?usp=sharing"
     
-    generator = GoogleSheetsReportGenerator(spreadsheet_url)
-    generator.generate_report()
+    parser = argparse.ArgumentParser(description="Daily report from the recruiter sheets")
+    parser.add_argument("--watch", metavar="CONFIG", help="keep the Daily Report current, sheets listed in a JSON config")
+    args = parser.parse_args()
+    if args.watch:
+        config = load_watch_config(args.watch)
+        generator = GoogleSheetsReportGenerator(config["spreadsheet_url"], blacklist_file=config.get("blacklist_file"),
+                                                contact_db=config.get("contact_db"))
+        generator.watch(config.get("sheets"), config.get("min_interval", WATCH_MIN_INTERVAL),
+                        config.get("max_interval", WATCH_MAX_INTERVAL))
+        return
+    
+    generator = GoogleSheetsReportGenerator(spreadsheet_url, snapshot_file=SNAPSHOT_DB if USE_SNAPSHOT else None,
+                                            offline=OFFLINE,
+                                            blacklist_file=BLACKLIST_CACHE if FLAG_BLACKLIST else None,
+                                            contact_db=CONTACT_DB if RECORD_CONTACTS else None)
+    if REPORT_DAYS > 1:
+        generator.generate_range_report(generator.today - timedelta(days=REPORT_DAYS - 1), generator.today)
+    else:
+        generator.generate_report()
     
     print("\nPress Enter to exit...")
     input()
@@ -0,0 +1,129 @@
+"""
+Per-sheet state kept between report runs.
+ScanState - high-water marks for incremental scans. Recruiter sheets only
+    grow at the bottom, so after a scan we remember, per spreadsheet and
+    sheet ID, the last FC row seen, a checksum of the last few FC cells and
+    the rows that already matched today's date. The next scan that day
+    re-reads only those trailing cells plus the new rows. If the trailing
+    cells changed (edits, deleted rows), or the FC column moved, or the
+    date rolled over, the sheet is scanned in full.
+HeaderCache - where each sheet's FC header is and what columns A-C hold,
+    so the 5 x 104 header block is only downloaded when the cached FC
+    cell no longer says "FC".
+"""
+
+import json
+import logging
+import os
+import zlib
+from pathlib import Path
+
+SCAN_STATE_FILE = "report_scan_state.json"
+HEADER_CACHE_FILE = "report_headers.json"
+TAIL_ROWS = 5                   # trailing FC cells re-read and checksummed on every scan
+
+DEFAULT_ROLES = {"name": 0, "phone": 1, "comment": 2}
+ROLE_KEYWORDS = {
+    "name": ("name",),
+    "phone": ("phone", "number", "tel", "mobile", "cell"),
+    "comment": ("comment", "note"),
+}
+
+
+def tail_checksum(cells):
+    """CRC32 of FC cell strings"""
+    return zlib.crc32("\x1f".join(str(cell) for cell in cells).encode("utf-8"))
+
+
+def column_roles(header_cells):
+    """Which of columns A-C hold name, phone and comment, from their header labels
+
+    Falls back to A=name, B=phone, C=comment unless all three are recognized.
+    """
+    roles = {}
+    for i, cell in enumerate(header_cells[:3]):
+        label = str(cell).lower()
+        for role, keywords in ROLE_KEYWORDS.items():
+            if role not in roles and any(word in label for word in keywords):
+                roles[role] = i
+                break
+    return roles if len(roles) == 3 else dict(DEFAULT_ROLES)
+
+
+class _JsonState:
+    """Dict of per-sheet entries persisted to a JSON file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning("Ignoring unreadable state file %s: %s", self.path, e)
+
+    def key(self, spreadsheet_id, sheet_id):
+        return f"{spreadsheet_id}/{sheet_id}"
+
+    def save(self):
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+class ScanState(_JsonState):
+    def __init__(self, path=SCAN_STATE_FILE):
+        super().__init__(path)
+
+    def lookup(self, key, today, fc_column, data_start_row):
+        """The stored entry if it can be resumed from, else None"""
+        entry = self.entries.get(key)
+        if (entry and entry["date"] == today and entry["fc_column"] == fc_column
+                and entry["data_start_row"] == data_start_row and entry["last_row"] >= data_start_row):
+            return entry
+        return None
+
+    def resume_row(self, entry, data_start_row):
+        """First row to fetch: the checksummed tail of the previous scan"""
+        if entry is None:
+            return data_start_row
+        return max(data_start_row, entry["last_row"] - TAIL_ROWS + 1)
+
+    def tail_matches(self, entry, cells, start):
+        """Do the re-read tail cells (cells[0] is row `start`) still match the checksum?"""
+        return tail_checksum(cells[:entry["last_row"] - start + 1]) == entry["checksum"]
+
+    def record(self, key, today, fc_column, data_start_row, cells, start, rows):
+        """Store the high-water mark after scanning cells[0] = row `start` to the end"""
+        last_row = start + len(cells) - 1
+        tail_start = max(data_start_row, last_row - TAIL_ROWS + 1)
+        self.entries[key] = {
+            "date": today,
+            "fc_column": fc_column,
+            "data_start_row": data_start_row,
+            "last_row": last_row,
+            "checksum": tail_checksum(cells[tail_start - start:]),
+            "rows": sorted(rows),
+        }
+
+
+class HeaderCache(_JsonState):
+    def __init__(self, path=HEADER_CACHE_FILE):
+        super().__init__(path)
+
+    def get(self, key):
+        """{"fc_column", "fc_index", "header_row", "roles"} or None"""
+        return self.entries.get(key)
+
+    def put(self, key, fc_index, fc_column, header_row, roles):
+        self.entries[key] = {
+            "fc_column": fc_column,
+            "fc_index": fc_index,
+            "header_row": header_row,
+            "roles": roles,
+        }
+
+    def forget(self, key):
+        self.entries.pop(key, None)
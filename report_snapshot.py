@@ -0,0 +1,76 @@
+"""
+Local snapshot cache for the daily report.
+Stores the FC and A:C columns of every scanned sheet in SQLite together
+with the spreadsheet's Drive modifiedTime. When the spreadsheet has not
+been modified since the snapshot, a report is built entirely from disk
+after one metadata request; with offline=True no request is made at all
+and the last snapshot is used as is.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+SNAPSHOT_DB = "report_snapshot.db"
+
+
+class SnapshotCache:
+    def __init__(self, db_path=SNAPSHOT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                spreadsheet_id  TEXT PRIMARY KEY,
+                modified_time   TEXT NOT NULL,
+                saved_at        TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sheets (
+                spreadsheet_id  TEXT NOT NULL,
+                sheet_name      TEXT NOT NULL,
+                position        INTEGER NOT NULL,
+                data_start_row  INTEGER NOT NULL,
+                fc_values       TEXT NOT NULL,
+                abc_values      TEXT NOT NULL,
+                PRIMARY KEY (spreadsheet_id, sheet_name)
+            )
+        """)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def modified_time(self, spreadsheet_id):
+        """Drive modifiedTime the snapshot was taken at, or None"""
+        row = self.conn.execute(
+            "SELECT modified_time FROM snapshots WHERE spreadsheet_id = ?", (spreadsheet_id,)).fetchone()
+        return row[0] if row else None
+
+    def load(self, spreadsheet_id):
+        """{sheet name: (data_start_row, fc_values, abc_values)} in sheet order"""
+        rows = self.conn.execute(
+            "SELECT sheet_name, data_start_row, fc_values, abc_values FROM sheets "
+            "WHERE spreadsheet_id = ? ORDER BY position", (spreadsheet_id,))
+        return {name: (start, json.loads(fc), json.loads(abc)) for name, start, fc, abc in rows}
+
+    def touch(self, spreadsheet_id, modified_time):
+        """Move the snapshot to a new modifiedTime (only our own Daily Report write happened since)"""
+        with self.conn:
+            self.conn.execute("UPDATE snapshots SET modified_time = ? WHERE spreadsheet_id = ?",
+                              (modified_time, spreadsheet_id))
+
+    def save(self, spreadsheet_id, modified_time, columns):
+        """Replace the snapshot with columns ({sheet name: (data_start_row, fc_values, abc_values)})"""
+        with self.conn:
+            self.conn.execute("DELETE FROM sheets WHERE spreadsheet_id = ?", (spreadsheet_id,))
+            self.conn.executemany(
+                "INSERT INTO sheets VALUES (?, ?, ?, ?, ?, ?)",
+                [(spreadsheet_id, name, position, start, json.dumps(fc), json.dumps(abc))
+                 for position, (name, (start, fc, abc)) in enumerate(columns.items())],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                (spreadsheet_id, modified_time, datetime.now().isoformat(timespec="seconds")),
+            )
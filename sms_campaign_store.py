@@ -0,0 +1,116 @@
+"""
+SQLite campaign store for the SMS sender.
+One row per normalized phone number with its send status, the message
+variant used and when it was sent. Status updates are single-row primary
+key writes, so marking a number no longer rewrites sms_numbers.csv.
+The CSV is only read at the start of a run (import) and written once at
+the end (export).
+Statuses:
+    pending  - not texted yet
+    sending  - send started but not confirmed (never retried automatically)
+    messaged - texted
+"""
+
+import csv
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from core import normalize_number
+
+CAMPAIGN_DB = "sms_campaign.db"
+
+
+class CampaignStore:
+    def __init__(self, db_path=CAMPAIGN_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS numbers (
+                number      TEXT PRIMARY KEY,
+                raw         TEXT NOT NULL,
+                position    INTEGER NOT NULL,
+                status      TEXT NOT NULL DEFAULT 'pending',
+                variant     INTEGER,
+                updated_at  TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_numbers_status ON numbers(status, position)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # === IMPORT / EXPORT (edges only) ===
+    def import_numbers(self, numbers):
+        """Add (normalized, raw) numbers as pending; known numbers keep their status."""
+        start = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM numbers").fetchone()[0]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO numbers (number, raw, position) VALUES (?, ?, ?)",
+                [(number, raw, start + i) for i, (number, raw) in enumerate(numbers)],
+            )
+            added = self.conn.total_changes - before
+        logging.info("Imported %d new numbers into %s.", added, self.db_path)
+        return added
+
+    def export_csv(self, file_path):
+        """Rewrite the CSV once, marking every row whose number was texted."""
+        path = Path(file_path)
+        if not path.exists():
+            return
+        done = self.contacted_numbers()
+
+        with open(path, newline="", encoding="utf-8") as csvfile:
+            rows = list(csv.reader(csvfile))
+        for row in rows:
+            if row and normalize_number(row[0]) in done:
+                if len(row) == 1:
+                    row.append("messaged")
+                else:
+                    row[1] = "messaged"
+
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", newline="", encoding="utf-8") as csvfile:
+            csv.writer(csvfile).writerows(rows)
+        os.replace(tmp_path, path)
+        logging.info("Exported campaign status to %s.", file_path)
+
+    # === QUERIES ===
+    def contacted_numbers(self):
+        """Set of numbers that were texted or had a send started."""
+        return {number for (number,) in self.conn.execute(
+            "SELECT number FROM numbers WHERE status != 'pending'")}
+
+    def messaged_rows(self):
+        """(number, raw, ISO send time) of every texted number."""
+        return self.conn.execute("SELECT number, raw, updated_at FROM numbers WHERE status = 'messaged'").fetchall()
+
+    def sent_since(self, timestamp):
+        """Numbers texted (or being texted) since an ISO timestamp."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM numbers WHERE status != 'pending' AND updated_at >= ?", (timestamp,)
+        ).fetchone()[0]
+
+    def status_counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM numbers GROUP BY status"))
+
+    # === UPDATES (O(1) primary-key writes) ===
+    def _set_status(self, number, status, variant=None):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE numbers SET status = ?, variant = COALESCE(?, variant), updated_at = ? WHERE number = ?",
+                (status, variant, datetime.now().isoformat(timespec="seconds"), number),
+            )
+
+    def mark_sending(self, number, variant):
+        """Record that a send is about to start; survives a crash mid-send."""
+        self._set_status(number, "sending", variant)
+
+    def mark_messaged(self, number, variant=None):
+        self._set_status(number, "messaged", variant)
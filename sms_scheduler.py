@@ -0,0 +1,64 @@
+"""
+Send scheduler for SMS campaigns.
+Combines:
+1. Per-hour and per-day token buckets (quotas, smooth spacing, no bursts)
+2. Per-recipient local-time windows derived from the area code
+3. A priority queue (dialer_queue.CallQueue) that hands out the earliest
+   pending number whose local time is inside the window
+The clock is injectable, so the schedule is deterministic and can be
+replayed in the simulator or checked by hand.
+"""
+
+from datetime import datetime, timezone
+
+from core import TokenBucket
+from dialer_queue import CallQueue
+
+# === CONFIG ===
+HOURLY_QUOTA = 120              # texts per hour
+DAILY_QUOTA = 800               # texts per rolling 24 hours
+BURST = 1                       # texts allowed back to back (1 = evenly spaced)
+SEND_WINDOW = (9, 20)           # recipient local hours (start, end)
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+class SendScheduler:
+    """Decides which number to text next and when."""
+
+    def __init__(self, numbers, hourly=HOURLY_QUOTA, daily=DAILY_QUOTA, window=SEND_WINDOW,
+                 burst=BURST, sent_last_day=0, clock=utc_now):
+        """numbers: (number, raw) tuples in priority order."""
+        self.numbers = numbers
+        self.clock = clock
+        now = clock().timestamp()
+        self.hour_bucket = TokenBucket(hourly / 3600, burst, now=now)
+        self.day_bucket = TokenBucket(daily / 86400, daily, tokens=daily - sent_last_day, now=now)
+        rows = ((i, [raw, ""]) for i, (_, raw) in enumerate(numbers))
+        self.queue = CallQueue(rows, window, clock)
+
+    def next_send(self):
+        """Return (wait_seconds, item).
+
+        (0, (number, raw)) - send this one now; quota tokens are taken
+        (seconds, None)    - nothing may be sent yet; ask again after waiting
+        (None, None)       - every number has been handed out
+        """
+        now = self.clock()
+        index = self.queue.peek(now)
+        if index is None:
+            if self.queue.empty():
+                return None, None
+            return self.queue.seconds_until_open(now), None
+
+        t = now.timestamp()
+        wait = max(self.hour_bucket.wait_time(t), self.day_bucket.wait_time(t))
+        if wait > 0:
+            return wait, None
+
+        self.queue.pop_next(now, fallback=False)
+        self.hour_bucket.take(t)
+        self.day_bucket.take(t)
+        return 0, self.numbers[index]
@@ -1,6 +1,6 @@
 """
 Simplified bulk SMS sender using pyautogui.
-Procedure:
+Procedure (see sms_ui.send_steps):
 1. Copy number
 2. Click New Text button
 3. Paste (Ctrl+V) → Enter
@@ -8,18 +8,34 @@ Procedure:
 5. Click opt-out dismissal → Click Next button
 6. Paste (Ctrl+V) → Enter
 7. Repeat for all numbers
+Each step continues as soon as the watched screen region changes (see
+sms_ui.STEP_WAITS); human-like jitter is configured separately below
+Send rate follows hourly/daily quotas and recipient local time (see
+sms_scheduler.py)
 Numbers loaded from sms_numbers.csv (first column)
-Marks numbers as messaged in CSV to avoid duplicates
+Send status is tracked in sms_campaign.db (see sms_campaign_store.py), so
+interrupted runs resume without re-texting anyone; sms_numbers.csv is
+updated with "messaged" marks once at the end of the run
 """
 
 import time
 import random
 import logging
 import pyautogui
-import pyperclip
 import csv
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from contact_store import CONTACT_DB, ContactStore, import_sms_campaign, sms_exclusions
+from core import BLACKLIST_CACHE, lazy_import, load_blacklist_index, normalize_series
+from profiling import profiled, span
+from sms_campaign_store import CAMPAIGN_DB, CampaignStore
+from sms_scheduler import BURST, DAILY_QUOTA, HOURLY_QUOTA, SEND_WINDOW, SendScheduler
+from sms_ui import Pacing, PyAutoGuiScreen, send_steps
+
+pd = lazy_import("pandas")
+
 # Safety
 pyautogui.FAILSAFE = True
 pyautogui.PAUSE = 0.25
@@ -27,15 +43,24 @@ pyautogui.PAUSE = 0.25
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
 # === CONFIG ===
-ITERATIONS = 100                # max messages to send
+ITERATIONS = None               # optional max messages per run (quotas do the pacing)
 START_DELAY = 5                 # seconds before starting
 TEST_RUNS = 2                   # test sends first
+NUMBERS_FILE = "sms_numbers.csv"
+RECORD_CONTACTS = True          # share texted numbers via CONTACT_DB (contact_store.py)
+STEP_JITTER = (0.05, 0.25)      # extra random pause after each UI step (seconds)
+BETWEEN_SENDS = (1.0, 3.0)      # random pause between two texts (seconds)
+# HOURLY_QUOTA, DAILY_QUOTA, BURST and SEND_WINDOW are set in sms_scheduler.py
 
 # Coordinates
 COORDS = {
     "new_text_button": (332, 139),
     "next_button": (631, 551),
     "opt_out_dismiss": (95, 494),
+    # Only watched, never clicked (see sms_ui.STEP_WAITS)
+    "opt_out_notice": (95, 470),
+    "conversation_header": (631, 139),
+    "message_list": (631, 420),
 }
 
 # === MESSAGE ===
@@ -144,90 +169,113 @@ def get_random_message():
 MESSAGE = get_random_message()
 
 # === LOAD NUMBERS ===
-def load_numbers(file_path="sms_numbers.csv"):
+def load_numbers(file_path="sms_numbers.csv", blacklist=frozenset(), contacted=frozenset()):
+    """Return ([(normalized, raw), ...] to text, Counter of rows per filter reason).
+
+    Numbers are normalized in one vectorized pass; empty, duplicate,
+    already messaged (CSV mark or campaign history) and blacklisted
+    numbers are dropped. All membership checks are set lookups.
+    """
     path = Path(file_path)
     if not path.exists():
         logging.error("Numbers file %s not found.", file_path)
-        return []
+        return [], Counter()
 
-    numbers = []
-    rows = []
-
-    with open(path, newline='', encoding="utf-8") as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            rows.append(row)
-            if not row:
-                continue
-            num = row[0].strip()
-            # Skip already messaged numbers
-            if len(row) > 1 and row[1].lower() == "messaged":
-                continue
-            numbers.append((num, row))
-    return numbers, rows
-
-def mark_number_messaged(file_path, row_to_mark):
-    path = Path(file_path)
-    all_rows = []
     with open(path, newline='', encoding="utf-8") as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            all_rows.append(row)
-
-    for row in all_rows:
-        if row[0].strip() == row_to_mark[0].strip():
-            if len(row) == 1:
-                row.append("messaged")
-            elif len(row) > 1:
-                row[1] = "messaged"
-
-    with open(path, "w", newline='', encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerows(all_rows)
+        rows = [row for row in csv.reader(csvfile) if row]
+
+    df = pd.DataFrame({
+        "raw": [row[0].strip() for row in rows],
+        "marked": [len(row) > 1 and row[1].strip().lower() == "messaged" for row in rows],
+    })
+    df["number"] = normalize_series(df["raw"])
+
+    # A number counts as messaged if any of its rows is marked
+    messaged = set(df.loc[df["marked"], "number"].dropna()) | set(contacted)
+    empty = df["number"].isna()
+    duplicate = ~empty & df["number"].duplicated()
+    done = ~empty & ~duplicate & df["number"].isin(messaged)
+    blocked = ~empty & ~duplicate & ~done & df["number"].isin(blacklist)
+    keep = ~(empty | duplicate | done | blocked)
+
+    counts = Counter(empty=int(empty.sum()), duplicate=int(duplicate.sum()), messaged=int(done.sum()),
+                     blacklisted=int(blocked.sum()), kept=int(keep.sum()))
+    numbers = list(zip(df.loc[keep, "number"], df.loc[keep, "raw"]))
+    return numbers, counts
 
 # === HELPERS ===
-def paste_text(text):
-    pyperclip.copy(text)
-    time.sleep(0.2)  # short pause to ensure clipboard is ready
-    pyautogui.keyDown('ctrl')
-    pyautogui.press('v')
-    pyautogui.keyUp('ctrl')
-    time.sleep(0.3)  # wait for paste to register
-
-def send_one(number, message):
-    # 1. Click New Text
-    pyautogui.click(*COORDS['new_text_button'])
-    time.sleep(random.uniform(0.5, 1.0))
-
-    # 2. Paste number → Enter
-    paste_text(number)
-    time.sleep(random.uniform(0.5, 1.0))  # let UI register number
-    pyautogui.press('enter')
-    time.sleep(random.uniform(0.3, 0.6))
-
-    # 3. Dismiss opt-out message
-    pyautogui.click(*COORDS['opt_out_dismiss'])
-    time.sleep(random.uniform(0.3, 0.5))
-
-    # 4. Click Next button
-    pyautogui.click(*COORDS['next_button'])
-    time.sleep(0.5)  # wait for message field to get focus
-
-    # 5. Paste message → Enter
-    paste_text(message)
-    pyautogui.press('enter')
-    time.sleep(random.uniform(1.0, 2.0))  # polite delay between sends
+SCREEN = PyAutoGuiScreen()
+PACING = Pacing(STEP_JITTER, BETWEEN_SENDS)
+
+def send_one(number, message, screen=None, pacing=None):
+    send_steps(screen or SCREEN, COORDS, number, message, pacing or PACING)
+
+def send_and_record(store, number, raw):
+    msg_index, message = get_random_message()
+    # Recorded before sending: a crash mid-send leaves it 'sending', never re-texted
+    with span("record"):
+        store.mark_sending(number, msg_index)
+    with span("send"):
+        send_one(raw, message)
+    with span("record"):
+        store.mark_messaged(number)
+    return msg_index
+
+def wait_for_next(scheduler):
+    """Sleep until the scheduler allows the next send; None when all are done."""
+    while True:
+        wait, item = scheduler.next_send()
+        if item is not None or wait is None:
+            return item
+        if wait >= 60:
+            logging.info("Quota or calling window reached, next send in %.0f min.", wait / 60)
+        with span("quota wait"):
+            time.sleep(wait)
+
+def scheduler_clock():
+    return datetime.fromtimestamp(time.time(), timezone.utc)
 
 # === MAIN ===
+@profiled("sms_sender")
 def main():
-    numbers, _ = load_numbers("sms_numbers.csv")
+    store = CampaignStore(CAMPAIGN_DB)
+    contacts = ContactStore(CONTACT_DB) if RECORD_CONTACTS else None
+    try:
+        # Numbers texted by earlier campaigns or blocked by the cleaner are skipped too
+        texted, blocked = sms_exclusions(contacts) if contacts else (set(), set())
+        with span("load numbers"):
+            numbers, counts = load_numbers(NUMBERS_FILE, load_blacklist_index(BLACKLIST_CACHE) | blocked,
+                                           store.contacted_numbers() | texted)
+        logging.info("Numbers file: %d to text, %d duplicates, %d already messaged, "
+                     "%d blacklisted, %d empty.", counts["kept"], counts["duplicate"],
+                     counts["messaged"], counts["blacklisted"], counts["empty"])
+        with span("import numbers"):
+            store.import_numbers(numbers)
+        run_campaign(store, numbers)
+    finally:
+        with span("export csv"):
+            store.export_csv(NUMBERS_FILE)
+        if contacts:
+            with span("record contacts"):
+                import_sms_campaign(contacts, store)
+            contacts.close()
+        store.close()
+
+def run_campaign(store, numbers):
+    unconfirmed = store.status_counts().get("sending", 0)
+    if unconfirmed:
+        logging.warning("%d numbers have an unconfirmed send from an earlier run and will be skipped.", unconfirmed)
     if not numbers:
         logging.error("No numbers found to send, exiting.")
         return
 
-    total = min(ITERATIONS, len(numbers))
+    total = len(numbers) if ITERATIONS is None else min(ITERATIONS, len(numbers))
     logging.info("Loaded %d numbers. Will attempt %d sends.", len(numbers), total)
 
+    day_ago = (datetime.now() - timedelta(days=1)).isoformat(timespec="seconds")
+    scheduler = SendScheduler(numbers, HOURLY_QUOTA, DAILY_QUOTA, SEND_WINDOW, BURST,
+                              sent_last_day=store.sent_since(day_ago), clock=scheduler_clock)
+
     # === PRE-RUN CHECKS ===
     input("Is RingCentral opened in the correct location? Press Enter to continue...")
     input("Is the Text tab active? Press Enter to continue...")
@@ -239,23 +287,26 @@ def main():
     runs = min(TEST_RUNS, total)
     logging.info("Running %d test sends first.", runs)
     for i in range(runs):
-        num, row = numbers[i]
-        msg_index, message = get_random_message()  # correct unpacking
-        logging.info("Test run %d/%d , message #%d -> %s", i+1, runs, msg_index, num)
-        send_one(num, message)
-        mark_number_messaged("sms_numbers.csv", row)
+        item = wait_for_next(scheduler)
+        if item is None:
+            break
+        num, raw = item
+        msg_index = send_and_record(store, num, raw)
+        logging.info("Test run %d/%d , message #%d -> %s", i+1, runs, msg_index, raw)
 
     input("If test looked correct, press Enter to continue with the remaining sends (or Ctrl+C to abort)...")
 
     # Full run
     for i in range(runs, total):
         try:
-            num, row = numbers[i]
-            msg_index, message = get_random_message()  # correct unpacking
-            logging.info("Full run %d/%d , message #%d -> %s", i+1, total, msg_index, num)
-            send_one(num, message)
-            mark_number_messaged("sms_numbers.csv", row)
-            time.sleep(random.uniform(2.0, 6.0))
+            item = wait_for_next(scheduler)
+            if item is None:
+                logging.info("No more numbers inside their calling window.")
+                break
+            num, raw = item
+            msg_index = send_and_record(store, num, raw)
+            logging.info("Full run %d/%d , message #%d -> %s", i+1, total, msg_index, raw)
+            PACING.between_sends(SCREEN)
         except KeyboardInterrupt:
             logging.warning("Interrupted by user. Exiting.")
             break
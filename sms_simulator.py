@@ -0,0 +1,292 @@
+"""
+Offline throughput simulator for sms_sender_local.
+Installs fake pyautogui/pyperclip modules backed by sms_ui.FakeScreen on a
+virtual clock, then runs sms_sender_local.main() end to end over a
+synthetic sms_numbers.csv in a temporary folder.
+Reports sends/hour, time per UI step, steps that continued before the UI
+had handled them, and persistence overhead for every combination of
+pacing policy and persistence strategy.
+Usage:
+    python sms_simulator.py --numbers 20000 --sends 100 --latency 0.05 0.3
+"""
+
+import argparse
+import builtins
+import csv
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import sms_ui
+from core import normalize_number
+from nanp_timezones import ZONES, in_window
+from sms_scheduler import SEND_WINDOW
+
+SIM_DAY = 1782864000.0      # 2026-07-01 00:00 UTC, a weekday in DST
+
+
+def first_hour_all_open(day_start, window=SEND_WINDOW):
+    """First whole UTC hour of the day at which every NANP zone is inside window"""
+    for hour in range(24):
+        epoch = day_start + hour * 3600
+        if all(in_window(zone, window, datetime.fromtimestamp(epoch, timezone.utc)) for zone in ZONES):
+            return epoch
+    raise ValueError(f"No hour has every zone inside {window}")
+
+
+# Simulated runs start when no synthetic area code (down to Hawaii) is held back
+BASE_EPOCH = first_hour_all_open(SIM_DAY)
+
+
+class Simulation:
+    """Holds the fake screen that the fake modules talk to."""
+
+    def __init__(self):
+        self.screen = None
+        self.pause = 0.0
+        self.ctrl_down = False
+
+    # pyautogui sleeps PAUSE seconds after every call; model that cost too
+    def _gui_call(self, fn, *args):
+        fn(*args)
+        self.screen.sleep(self.pause)
+
+    def key_down(self, key):
+        self.ctrl_down = self.ctrl_down or key == 'ctrl'
+        self.screen.sleep(self.pause)
+
+    def key_up(self, key):
+        self.ctrl_down = self.ctrl_down and key != 'ctrl'
+        self.screen.sleep(self.pause)
+
+    def press(self, key):
+        if self.ctrl_down and key == 'v':
+            self._gui_call(self.screen.hotkey_paste)
+        else:
+            self._gui_call(self.screen.press, key)
+
+
+SIM = Simulation()
+
+
+class _Screenshot:
+    def __init__(self, value):
+        self.value = value
+
+    def tobytes(self):
+        return repr(self.value).encode()
+
+
+def _install_fake_modules():
+    """Register fake pyautogui/pyperclip/time shims before sms_sender_local is imported."""
+    gui = types.ModuleType("pyautogui")
+    gui.FAILSAFE = True
+    gui.PAUSE = 0.0
+    gui.click = lambda x, y: SIM._gui_call(SIM.screen.click, (x, y))
+    gui.press = SIM.press
+    gui.keyDown = SIM.key_down
+    gui.keyUp = SIM.key_up
+
+    def screenshot(region=None):
+        x, y, w, h = region
+        return _Screenshot(SIM.screen.checksum((x + w // 2, y + h // 2)))
+    gui.screenshot = screenshot
+
+    clip = types.ModuleType("pyperclip")
+    clip.copy = lambda text: SIM.screen.copy(text)
+    clip.paste = lambda: SIM.screen.clipboard()
+
+    sys.modules["pyautogui"] = gui
+    sys.modules["pyperclip"] = clip
+    return gui
+
+
+def _virtual_time():
+    """Stand-in for the `time` module that runs on the simulated clock."""
+    shim = types.SimpleNamespace(**{name: getattr(time, name) for name in dir(time) if not name.startswith("_")})
+    shim.sleep = lambda seconds: SIM.screen.sleep(seconds)
+    shim.monotonic = lambda: SIM.screen.now()
+    shim.time = lambda: BASE_EPOCH + SIM.screen.now()
+    return shim
+
+
+class CsvRewriteStore:
+    """The old persistence strategy: re-read and rewrite the CSV after every text."""
+
+    def __init__(self, db_path=None):
+        self.file_path = "sms_numbers.csv"
+        self.db_path = self.file_path
+        self.pending_rows = []
+        self.messaged = []      # (number, raw, ISO send time)
+
+    def import_numbers(self, numbers):
+        pass
+
+    def contacted_numbers(self):
+        return set()
+
+    def sent_since(self, timestamp):
+        return 0
+
+    def messaged_rows(self):
+        return self.messaged
+
+    def status_counts(self):
+        return {}
+
+    def mark_sending(self, number, variant):
+        pass
+
+    def mark_messaged(self, number, variant=None):
+        with open(self.file_path, newline="", encoding="utf-8") as csvfile:
+            all_rows = list(csv.reader(csvfile))
+        raws = [row[0].strip() for row in all_rows if row and normalize_number(row[0]) == number]
+        if raws:
+            self.messaged.append((number, raws[0], datetime.now().isoformat(timespec="seconds")))
+        for row in all_rows:
+            if row and normalize_number(row[0]) == number:
+                if len(row) == 1:
+                    row.append("messaged")
+                else:
+                    row[1] = "messaged"
+        with open(self.file_path, "w", newline="", encoding="utf-8") as csvfile:
+            csv.writer(csvfile).writerows(all_rows)
+
+    def export_csv(self, file_path):
+        pass
+
+    def close(self):
+        pass
+
+
+def _timed_store(store_class, stats):
+    """Subclass a store so status writes are timed with the real clock."""
+    class TimedStore(store_class):
+        def mark_sending(self, *args, **kwargs):
+            start = time.perf_counter()
+            super().mark_sending(*args, **kwargs)
+            stats["persist"].append(time.perf_counter() - start)
+
+        def mark_messaged(self, *args, **kwargs):
+            start = time.perf_counter()
+            super().mark_messaged(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            stats["persist"].append(elapsed)
+            # Persistence is real work, so it also moves the simulated clock
+            SIM.screen.sleep(elapsed)
+    return TimedStore
+
+
+def write_synthetic_numbers(path, count, seed=0):
+    rng = random.Random(seed)
+    area_codes = ["212", "305", "312", "404", "512", "602", "713", "818", "907", "808"]
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        for i in range(count):
+            writer.writerow([f"({rng.choice(area_codes)}) {rng.randrange(200, 999)}-{i % 10000:04d}", ""])
+
+
+def run_once(sender, n_numbers, n_sends, latency, pacing, persistence, seed=0, hourly=None):
+    """Run sms_sender_local.main() once; returns a stats dict."""
+    stats = defaultdict(list)
+    SIM.screen = sms_ui.FakeScreen(sender.COORDS, latency=latency, seed=seed)
+    SIM.pause = sender.pyautogui.PAUSE
+
+    original_run_step = sms_ui.run_step
+
+    def timed_run_step(screen, coords, step, *args, **kwargs):
+        start = screen.now()
+        original_run_step(screen, coords, step, *args, **kwargs)
+        stats[step].append(screen.now() - start)
+        if SIM.screen.busy():
+            stats["early"].append(step)
+
+    if persistence == "sqlite":
+        from sms_campaign_store import CampaignStore
+        store_class = _timed_store(CampaignStore, stats)
+    else:
+        store_class = _timed_store(CsvRewriteStore, stats)
+
+    cwd = os.getcwd()
+    saved = (sender.ITERATIONS, sender.START_DELAY, sender.PACING, sender.CampaignStore,
+             sender.HOURLY_QUOTA, builtins.input)
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            os.chdir(tmp)
+            write_synthetic_numbers(Path(tmp) / "sms_numbers.csv", n_numbers, seed)
+            sender.ITERATIONS = n_sends
+            sender.START_DELAY = 0
+            sender.PACING = pacing
+            sender.CampaignStore = store_class
+            sender.HOURLY_QUOTA = hourly or sender.HOURLY_QUOTA
+            builtins.input = lambda prompt="": ""
+            sms_ui.run_step = timed_run_step
+            sim_start = SIM.screen.now()
+            wall_start = time.perf_counter()
+            sender.main()
+            stats["wall"] = time.perf_counter() - wall_start
+            stats["elapsed"] = SIM.screen.now() - sim_start
+        finally:
+            os.chdir(cwd)
+            sms_ui.run_step = original_run_step
+            (sender.ITERATIONS, sender.START_DELAY, sender.PACING,
+             sender.CampaignStore, sender.HOURLY_QUOTA, builtins.input) = saved
+    stats["sends"] = len(stats["message"])
+    return stats
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def report(label, stats):
+    sends, elapsed = stats["sends"], stats["elapsed"]
+    per_hour = sends * 3600 / elapsed if elapsed else 0.0
+    print(f"\n=== {label} ===")
+    print(f"  Sends: {sends} in {elapsed:.1f}s simulated ({stats['wall']:.2f}s real)")
+    print(f"  Throughput: {per_hour:.0f} sends/hour")
+    for step in sms_ui.STEP_WAITS:
+        early = stats["early"].count(step)
+        print(f"  {step:<10} {_mean(stats[step]) * 1000:8.1f} ms/step" + (f"  ({early} ended early)" if early else ""))
+    persist = stats["persist"]
+    print(f"  persistence {_mean(persist) * 1000:7.2f} ms/write, {sum(persist):.3f}s total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput simulator for sms_sender_local")
+    parser.add_argument("--numbers", type=int, default=20000, help="rows in the synthetic sms_numbers.csv")
+    parser.add_argument("--sends", type=int, default=100, help="texts to send per run (ITERATIONS)")
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.05, 0.3), help="UI latency range in seconds")
+    parser.add_argument("--pacing", nargs="+", default=["none", "default"], choices=["none", "default"])
+    parser.add_argument("--persistence", nargs="+", default=["sqlite", "csv"], choices=["sqlite", "csv"])
+    parser.add_argument("--hourly", type=int, default=None,
+                        help="override HOURLY_QUOTA (e.g. 100000 to measure the raw UI ceiling)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    _install_fake_modules()
+    import sms_sender_local as sender
+    sender.time = _virtual_time()
+    sms_ui.time = sender.time
+    logging.getLogger().setLevel(logging.WARNING)
+
+    policies = {
+        "none": sms_ui.Pacing(seed=args.seed),
+        "default": sms_ui.Pacing(sender.STEP_JITTER, sender.BETWEEN_SENDS, seed=args.seed),
+    }
+    for pacing_name in args.pacing:
+        for persistence in args.persistence:
+            stats = run_once(sender, args.numbers, args.sends, tuple(args.latency),
+                             policies[pacing_name], persistence, args.seed, args.hourly)
+            report(f"pacing={pacing_name}, persistence={persistence}", stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Screen backends, state-driven waits and pacing for the SMS sender.
+Instead of fixed sleeps, every step of a send watches a small region
+around one of the COORDS points and continues as soon as its checksum
+changes, or after the step's timeout at the latest. The watched region is
+one that only the step's outcome repaints, never the button or field the
+step itself clicks or pastes into, so a hover highlight or the pasted text
+cannot end the wait early.
+Human-like jitter is a separate, configurable Pacing policy.
+Backends:
+    PyAutoGuiScreen - the real screen (pyautogui + pyperclip)
+    FakeScreen      - in-memory stand-in with configurable UI latency,
+                      runs on a virtual clock so sends can be measured on Linux
+"""
+
+import heapq
+import logging
+import random
+import time
+import zlib
+
+POLL_INTERVAL = 0.05            # seconds between region checks
+CLIPBOARD_TIMEOUT = 0.5         # max wait for the clipboard to hold the new text
+PASTE_SETTLE = 0.1              # pause between Ctrl+V and Enter
+REGION_RADIUS = 12              # half-size in pixels of the checked region
+
+# step -> (COORDS point whose region must change, timeout in seconds)
+# Timeouts match the old fixed sleeps, so a missed change is never slower than before.
+STEP_WAITS = {
+    "new_text": ("next_button", 1.0),           # compose panel opens
+    "number": ("opt_out_notice", 1.6),          # recipient accepted, opt-out notice shown
+    "opt_out": ("opt_out_notice", 0.5),         # opt-out notice dismissed
+    "next": ("conversation_header", 0.5),       # conversation with the recipient loads
+    "message": ("message_list", 2.0),           # sent message appears in the conversation
+}
+
+# FakeScreen's model of the UI, by COORDS name:
+# (action, target or focused field) -> (regions repainted at once, regions repainted once handled)
+# The compose bar, where pasted text shows, sits around the Next button.
+FAKE_UI = {
+    ("click", "new_text_button"): (("new_text_button",), ("next_button",)),
+    ("paste", "recipient"): (("next_button",), ()),
+    ("enter", "recipient"): ((), ("opt_out_notice",)),
+    ("click", "opt_out_dismiss"): (("opt_out_dismiss",), ("opt_out_notice",)),
+    ("click", "next_button"): (("next_button",), ("conversation_header",)),
+    ("paste", "message"): (("next_button",), ()),
+    ("enter", "message"): ((), ("next_button", "message_list")),
+}
+FAKE_FOCUS = {"new_text_button": "recipient", "next_button": "message"}  # click -> focused field
+
+
+# === BACKENDS ===
+class PyAutoGuiScreen:
+    """Real screen, mouse, keyboard and clipboard."""
+
+    def __init__(self):
+        import pyautogui
+        import pyperclip
+        self.gui = pyautogui
+        self.clip = pyperclip
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def click(self, point):
+        self.gui.click(*point)
+
+    def press(self, key):
+        self.gui.press(key)
+
+    def hotkey_paste(self):
+        self.gui.keyDown('ctrl')
+        self.gui.press('v')
+        self.gui.keyUp('ctrl')
+
+    def copy(self, text):
+        self.clip.copy(text)
+
+    def clipboard(self):
+        return self.clip.paste()
+
+    def checksum(self, point, radius=REGION_RADIUS):
+        x, y = point
+        image = self.gui.screenshot(region=(x - radius, y - radius, 2 * radius, 2 * radius))
+        return zlib.crc32(image.tobytes())
+
+
+class FakeScreen:
+    """In-memory RingCentral stand-in.
+
+    Each region (a COORDS point) has its own state. An action repaints only
+    the regions FAKE_UI lists for it: its direct feedback (press highlight,
+    pasted text) after `feedback_latency`, its outcome after `latency`
+    (uniform ranges in seconds). A checksum changes once a repaint of its
+    region is visible. With virtual_time=True sleeping just advances the clock.
+    """
+
+    def __init__(self, coords=None, latency=(0.05, 0.3), feedback_latency=(0.0, 0.02),
+                 clipboard_latency=(0.0, 0.02), virtual_time=True, seed=None):
+        self.names = {point: name for name, point in (coords or {}).items()}
+        self.latency = latency
+        self.feedback_latency = feedback_latency
+        self.clipboard_latency = clipboard_latency
+        self.virtual_time = virtual_time
+        self.rng = random.Random(seed)
+        self.t = 0.0
+        self.repaints = []      # heap of (visible at, sequence, region, is outcome)
+        self.versions = {}      # region -> repaints already visible
+        self.focus = None
+        self.clip_text = ""
+        self.clip_ready_at = 0.0
+        self.actions = []       # (time, action, argument) log
+
+    def now(self):
+        return self.t if self.virtual_time else time.monotonic()
+
+    def sleep(self, seconds):
+        if self.virtual_time:
+            self.t += seconds
+        else:
+            time.sleep(seconds)
+
+    def _act(self, action, argument, target):
+        now = self.now()
+        self.actions.append((now, action, argument))
+        feedback, outcome = FAKE_UI.get((action, target), ((), ()))
+        for regions, latency, is_outcome in ((feedback, self.feedback_latency, False),
+                                             (outcome, self.latency, True)):
+            visible_at = now + self.rng.uniform(*latency)
+            for region in regions:
+                heapq.heappush(self.repaints, (visible_at, len(self.actions), region, is_outcome))
+
+    def click(self, point):
+        target = self.names.get(point, point)
+        self._act("click", point, target)
+        self.focus = FAKE_FOCUS.get(target, self.focus)
+
+    def press(self, key):
+        self._act("enter" if key == "enter" else "press", key, self.focus)
+
+    def hotkey_paste(self):
+        self._act("paste", self.clipboard(), self.focus)
+
+    def copy(self, text):
+        self.clip_text = text
+        self.clip_ready_at = self.now() + self.rng.uniform(*self.clipboard_latency)
+
+    def clipboard(self):
+        return self.clip_text if self.now() >= self.clip_ready_at else ""
+
+    def _show_repaints(self):
+        now = self.now()
+        while self.repaints and self.repaints[0][0] <= now:
+            _, _, region, _ = heapq.heappop(self.repaints)
+            self.versions[region] = self.versions.get(region, 0) + 1
+
+    def checksum(self, point, radius=REGION_RADIUS):
+        self._show_repaints()
+        region = self.names.get(point, point)
+        return hash((region, self.versions.get(region, 0)))
+
+    def busy(self):
+        """True while the app has not finished handling an earlier action"""
+        self._show_repaints()
+        return any(is_outcome for _, _, _, is_outcome in self.repaints)
+
+
+# === PACING ===
+class Pacing:
+    """Deliberate human-like jitter, independent of the readiness waits."""
+
+    def __init__(self, step_jitter=(0.0, 0.0), between_sends=(0.0, 0.0), seed=None):
+        self.step_jitter = step_jitter
+        self.between = between_sends
+        self.rng = random.Random(seed)
+
+    def after_step(self, screen):
+        if self.step_jitter[1] > 0:
+            screen.sleep(self.rng.uniform(*self.step_jitter))
+
+    def between_sends(self, screen):
+        if self.between[1] > 0:
+            screen.sleep(self.rng.uniform(*self.between))
+
+
+# === WAITS ===
+def wait_for_change(screen, point, before, timeout, poll=POLL_INTERVAL):
+    """Poll the region around point until its checksum differs from before."""
+    deadline = screen.now() + timeout
+    while screen.now() < deadline:
+        if screen.checksum(point) != before:
+            return True
+        screen.sleep(poll)
+    return False
+
+
+def paste_text(screen, text):
+    """Copy text, wait until the clipboard holds it, then Ctrl+V."""
+    screen.copy(text)
+    deadline = screen.now() + CLIPBOARD_TIMEOUT
+    while screen.clipboard() != text and screen.now() < deadline:
+        screen.sleep(0.01)
+    screen.hotkey_paste()
+
+
+def run_step(screen, coords, step, action, pacing, step_waits=STEP_WAITS):
+    """Run one UI action and wait for its watched region to react."""
+    target, timeout = step_waits[step]
+    before = screen.checksum(coords[target])
+    action()
+    if not wait_for_change(screen, coords[target], before, timeout):
+        logging.debug("Step '%s': no change at %s after %.1fs, continuing.", step, target, timeout)
+    pacing.after_step(screen)
+
+
+def send_steps(screen, coords, number, message, pacing, step_waits=STEP_WAITS):
+    """The New Text -> number -> opt-out -> Next -> message sequence."""
+    def enter_text(text):
+        paste_text(screen, text)
+        screen.sleep(PASTE_SETTLE)
+        screen.press('enter')
+
+    run_step(screen, coords, "new_text", lambda: screen.click(coords['new_text_button']), pacing, step_waits)
+    run_step(screen, coords, "number", lambda: enter_text(number), pacing, step_waits)
+    run_step(screen, coords, "opt_out", lambda: screen.click(coords['opt_out_dismiss']), pacing, step_waits)
+    run_step(screen, coords, "next", lambda: screen.click(coords['next_button']), pacing, step_waits)
+    run_step(screen, coords, "message", lambda: enter_text(message), pacing, step_waits)
@@ -0,0 +1,106 @@
+"""
+Startup-time benchmark for the entry-point scripts.
+Each module is imported in a fresh interpreter (after one warm-up import
+so bytecode is cached) and the import time and the heavy dependencies it
+pulled in (pandas, numpy, gspread) are reported. With --baseline the same
+measurement runs on a git revision exported to a temporary directory, to
+show the cost before and after core.lazy_import:
+    python startup_benchmark.py --baseline HEAD~1
+Scripts whose dependencies are not installed (pyautogui, keyboard, ...)
+are listed as missing; scripts that run their job on import report the
+exception the job raised.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ENTRY_POINTS = [
+    "check_blacklist_app",
+    "blacklist_checker",
+    "blacklist_checker_produce_table",
+    "google_sheets_blacklist_checker",
+    "blacklist_cache",
+    "report_generator_sheets",
+    "sms_sender_local",
+    "sms_simulator",
+    "copy_paste",
+    "copy_paste_spedup",
+]
+HEAVY_MODULES = ("pandas", "numpy", "gspread")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    import {module}
+    status = "ok"
+except ModuleNotFoundError as e:
+    status = f"missing {{e.name}}"
+except BaseException as e:
+    status = type(e).__name__
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "status": status,
+                  "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module, directory, repeats):
+    """(median import seconds, status, heavy modules loaded) for one module"""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    results = []
+    for _ in range(repeats + 1):  # the first run compiles bytecode and is discarded
+        output = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True,
+                                text=True, stdin=subprocess.DEVNULL, timeout=120).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    results = results[1:]
+    return statistics.median(r["seconds"] for r in results), results[0]["status"], results[0]["heavy"]
+
+
+def export_revision(revision, directory):
+    """Write the tree of a git revision into directory"""
+    archive = subprocess.run(["git", "archive", "--format=tar", revision],
+                             cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+
+
+def describe(seconds, status, heavy):
+    if status.startswith("missing"):
+        return f"{status:>24}"
+    note = "" if status == "ok" else f" ({status})"
+    return f"{seconds * 1000:>7.0f} ms  {','.join(heavy) or '-':<21}{note}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of each entry-point script")
+    parser.add_argument("--baseline", help="git revision to compare against, e.g. HEAD~1")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.baseline:
+            export_revision(args.baseline, tmp)
+            print(f"{'script':<34} {'before (' + args.baseline + ')':<52} after")
+        else:
+            print(f"{'script':<34} import time")
+        for module in args.modules:
+            after = describe(*measure(module, here, args.repeats))
+            if args.baseline:
+                before = describe(*measure(module, tmp, args.repeats))
+                print(f"{module:<34} {before:<52} {after}")
+            else:
+                print(f"{module:<34} {after}")
+
+
+if __name__ == "__main__":
+    main()